@@ -155,8 +155,7 @@ class DifferenceEditorWindow(QtWidgets.QMainWindow):
         self.total_count.setStyleSheet("color:#333;font-weight:500;")
 
         # initialize scenes/view
-        QtCore.QTimer.singleShot(0, lambda: self.up_view.fitInView(self.up_scene.sceneRect(), QtCore.Qt.KeepAspectRatio))
-        QtCore.QTimer.singleShot(0, lambda: self.down_view.fitInView(self.down_scene.sceneRect(), QtCore.Qt.KeepAspectRatio))
+        QtCore.QTimer.singleShot(0, self._fit_views)
 
         # load existing config if exists
         self.load_existing_config()
@@ -267,10 +266,15 @@ class DifferenceEditorWindow(QtWidgets.QMainWindow):
         self.update_total_count()
 
 
+    def _fit_views(self) -> None:
+        # 上下两视图在同一次延迟回调里适配，只投递一个定时事件
+        self.up_view.fitInView(self.up_scene.sceneRect(), QtCore.Qt.KeepAspectRatio)
+        self.down_view.fitInView(self.down_scene.sceneRect(), QtCore.Qt.KeepAspectRatio)
+
     def _on_item_chaned(self, diff_id: str)->None:
         self._make_dirty()
 
-    def _add_rect_items(self, diff: Difference) -> None:
+    def _add_rect_items(self, diff: Difference, refresh: bool = True) -> None:
         color = CATEGORY_COLOR_MAP.get(diff.category, QtGui.QColor('#ff0000'))
         item_up = DifferenceItem(diff, color, on_change=self._on_item_chaned, is_up=True)
         item_down = DifferenceItem(diff, color, on_change=self._on_item_chaned, is_up=False)
@@ -278,7 +282,8 @@ class DifferenceEditorWindow(QtWidgets.QMainWindow):
         self.down_scene.addItem(item_down)
         self.rect_items_up[diff.id] = item_up
         self.rect_items_down[diff.id] = item_down
-        self.refresh_visibility()
+        if refresh:
+            self.refresh_visibility()
 
     def rebuild_lists(self) -> None:
         down = self.current_list('down')
@@ -692,19 +697,14 @@ class DifferenceEditorWindow(QtWidgets.QMainWindow):
         if diff.hint_level == lvl:
             return
 
-        # 1) 写回 dataclass
-        diff.hint_level = lvl
+        # 1) 经 model 一次写入并广播（上下两侧图元共享同一 model，只需通知一次）
+        it = self.rect_items_up.get(diff.id) or self.rect_items_down.get(diff.id)
+        if it:
+            m = it.model
+            m.set_all(m.x, m.y, m.width, m.height, m.cx, m.cy, lvl, source=self)
 
-        # 2) 通知两个场景的对应 DifferenceItem 重绘（并尽量发信号以便其刷新边界/shape）
-        for it in (self.rect_items_up.get(diff.id), self.rect_items_down.get(diff.id)):
-            if not it:
-                continue
-            try:
-                # 模型包的是同一个 dataclass，这里为了让视图可靠刷新，显式通知
-                it.model.data.hint_level = lvl
-                it.model.anyChanged.emit(self)   # 触发 _on_model_any_changed -> update()
-            except Exception:
-                it.update()
+        # 2) 写回 dataclass（与 model 同一对象时为空操作）
+        diff.hint_level = lvl
 
         # 3) UI 脏
         self._make_dirty()
@@ -1008,8 +1008,10 @@ class DifferenceEditorWindow(QtWidgets.QMainWindow):
                 cb=float(cb)
             )
             self.differences.append(d)
-            self._add_rect_items(d)
+            self._add_rect_items(d, refresh=False)
 
+        # 批量载入：全部图元建好后统一刷新一次可见性（避免每加一项全量遍历）
+        self.refresh_visibility()
         self.rebuild_lists()
         self.update_total_count()
 
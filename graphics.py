@@ -1,6 +1,10 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+import functools
+import logging
+import math
+
 from PySide6 import QtCore, QtGui, QtWidgets
 from typing import Optional, Dict, Tuple
 
@@ -8,6 +12,22 @@ from typing import Optional, Dict, Tuple
 from models import Difference, RADIUS_LEVELS, MIN_RECT_SIZE
 from circle_provider import CirclePixmapProvider
 
+# 半径等级上限（RADIUS_LEVELS 为静态表）
+_MAX_LEVEL: int = len(RADIUS_LEVELS)
+
+# 热路径常用 Qt 常量：模块级绑定，省去逐次多级属性查找
+_ALIGN_CENTER = QtCore.Qt.AlignCenter
+_TEXT_FLAGS   = QtCore.Qt.AlignCenter | QtCore.Qt.TextWordWrap | QtCore.Qt.TextWrapAnywhere
+_CUR_OPEN   = QtCore.Qt.OpenHandCursor
+_CUR_CLOSED = QtCore.Qt.ClosedHandCursor
+_CUR_HOR    = QtCore.Qt.SizeHorCursor
+_CUR_VER    = QtCore.Qt.SizeVerCursor
+_CUR_FDIAG  = QtCore.Qt.SizeFDiagCursor
+_CUR_BDIAG  = QtCore.Qt.SizeBDiagCursor
+
+# 无场景时的兜底边界 (l, t, r, b)
+_NO_SCENE_BOUNDS: Tuple[float, float, float, float] = (-1e6, -1e6, 1e6, 1e6)
+
 # ==============================================================
 # 1) Model：作为唯一真源（SSOT），负责自动维护 hint_level
 # ==============================================================
@@ -22,6 +42,10 @@ class DifferenceModel(QtCore.QObject):
         super().__init__()
         self.data = d
         self._updating = False  # 批量/重入保护
+        self.revision = 0       # 每次经 setter 修改 +1，供视图层做缓存键
+        # anyChanged 合并：同一轮事件循环内多次修改只广播一次
+        self._any_pending = False
+        self._any_source = None
 
         self.set_rect(d.x, d.y, d.width, d.height, source=self, force=True)
 
@@ -77,8 +101,9 @@ class DifferenceModel(QtCore.QObject):
             return
 
         d.x, d.y, d.width, d.height = x, y, w, h
+        self.revision += 1
         self.geometryChanged.emit(source)
-        self.anyChanged.emit(source)
+        self._schedule_any(source)
 
     def set_circle(self, cx: float, cy: float, *, source=None):
         if self._updating: return
@@ -87,8 +112,32 @@ class DifferenceModel(QtCore.QObject):
         changed = (cx != d.cx) or (cy != d.cy)
         if not changed: return
         d.cx, d.cy = cx, cy
+        self.revision += 1
         self.circleChanged.emit(source)
-        self.anyChanged.emit(source)
+        self._schedule_any(source)
+
+    def set_all(self, x: float, y: float, w: float, h: float,
+                cx: float, cy: float, hint_level: int, *, source=None):
+        """一次写入矩形/圆心/等级：各专用信号仅在对应字段变化时发，anyChanged 只合并一次。"""
+        if self._updating: return
+        d = self.data
+        x, y, w, h = float(x), float(y), float(w), float(h)
+        cx, cy = float(cx), float(cy)
+        hint_level = int(hint_level)
+        rect_changed = (x != d.x) or (y != d.y) or (w != d.width) or (h != d.height)
+        circle_changed = (cx != d.cx) or (cy != d.cy)
+        level_changed = hint_level != d.hint_level
+        if not (rect_changed or circle_changed or level_changed):
+            return
+        d.x, d.y, d.width, d.height = x, y, w, h
+        d.cx, d.cy = cx, cy
+        d.hint_level = hint_level
+        self.revision += 1
+        if rect_changed:
+            self.geometryChanged.emit(source)
+        if circle_changed:
+            self.circleChanged.emit(source)
+        self._schedule_any(source)
 
     # ------- 设置 API -------
     def set_click_center(self, cx_abs: float, cy_abs: float, *, source=None):
@@ -100,7 +149,8 @@ class DifferenceModel(QtCore.QObject):
         changed = (cx_abs != getattr(d, "ccx", -1.0)) or (cy_abs != getattr(d, "ccy", -1.0))
         if not changed: return
         d.ccx, d.ccy = cx_abs, cy_abs
-        self.anyChanged.emit(source)
+        self.revision += 1
+        self._schedule_any(source)
 
     def set_click_axes(self, a: float, b: float, *, source=None):
         if self._updating: return
@@ -111,7 +161,8 @@ class DifferenceModel(QtCore.QObject):
         changed = (a != getattr(d, "ca", 0.0)) or (b != getattr(d, "cb", 0.0))
         if not changed: return
         d.ca, d.cb = a, b
-        self.anyChanged.emit(source)
+        self.revision += 1
+        self._schedule_any(source)
 
     def set_click_shape(self, shape: str, *, source=None):
         if self._updating: return
@@ -122,12 +173,36 @@ class DifferenceModel(QtCore.QObject):
         shape = str(shape) if shape in ("rect", "ellipse") else "rect"
         if shape == getattr(d, "cshape", "rect"): return
         d.cshape = shape
+        self.revision += 1
+        self._schedule_any(source)
+
+    # ------- anyChanged 延迟合并 -------
+    def _schedule_any(self, source):
+        if self._any_pending:
+            # 多个来源混合时不再指明来源
+            if source is not self._any_source:
+                self._any_source = None
+            return
+        self._any_pending = True
+        self._any_source = source
+        QtCore.QMetaObject.invokeMethod(self, "_flush_any", QtCore.Qt.QueuedConnection)
+
+    @QtCore.Slot()
+    def _flush_any(self):
+        if not self._any_pending:
+            return
+        source = self._any_source
+        self._any_pending = False
+        self._any_source = None
         self.anyChanged.emit(source)
 
     # 可选：批量更新（避免中间反复发信号）
     def begin(self): self._updating = True
     def end(self, *, source=None):
         self._updating = False
+        # 直接广播，已排队的合并广播作废
+        self._any_pending = False
+        self._any_source = None
         self.anyChanged.emit(source)
 
 
@@ -152,6 +227,174 @@ def get_model_for_difference(d: Difference) -> DifferenceModel:
     return DIFF_BUS.get_model(d)
 
 
+class _NotifyBus(QtCore.QObject):
+    """场景共用的 0ms 合并器：同一轮事件循环内同一 (id, 回调) 只触发一次。
+    用于图元 → 外部的 on_change 回调（异常照旧吞掉），以及拖动中的几何写回（异常记日志）。"""
+    def __init__(self):
+        super().__init__()
+        self._pending: Dict[Tuple[str, object], bool] = {}  # 保序去重；值=是否吞掉异常
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._drain)
+
+    def enqueue(self, diff_id: str, callback, quiet: bool = True) -> None:
+        if not callable(callback):
+            return
+        self._pending[(diff_id, callback)] = quiet
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _drain(self) -> None:
+        pending, self._pending = self._pending, {}
+        for (diff_id, callback), quiet in pending.items():
+            try:
+                callback(diff_id)
+            except Exception:
+                if not quiet:
+                    # 不中断其余回调，但不静默丢弃（如 model 写回失败）
+                    logging.getLogger(__name__).exception("回调失败: %s", diff_id)
+
+_NOTIFY_BUS: Optional[_NotifyBus] = None
+
+def _notify_bus() -> _NotifyBus:
+    # 延迟创建：QTimer 需在 QApplication 之后构造
+    global _NOTIFY_BUS
+    if _NOTIFY_BUS is None:
+        _NOTIFY_BUS = _NotifyBus()
+    return _NOTIFY_BUS
+
+
+# ==============================================================
+# 文本字号自适配：模块级 LRU，同字体/同尺寸/同文字的 item 共享结果
+# ==============================================================
+
+@functools.lru_cache(maxsize=4096)
+def _fit_pt(font_family: str, font_weight: QtGui.QFont.Weight,
+            box_w: int, box_h: int, text: str) -> float:
+    if box_w <= 1 or box_h <= 1 or not text:
+        return 10.0
+
+    lo, hi = 8.0, max(14.0, box_h * 0.9)
+    test_font = QtGui.QFont(font_family)
+    test_font.setWeight(font_weight)
+
+    # 以 10pt 为基准量一次，按比例直接估算字号（文字尺寸与字号近似线性）
+    base_pt = 10.0
+    test_font.setPointSizeF(base_pt)
+    fm = QtGui.QFontMetricsF(test_font)
+    adv = fm.horizontalAdvance(text)
+    line_h = fm.height()
+    if adv <= 0 or line_h <= 0:
+        return lo
+    # 行数：使 “每行宽/框宽” 与 “总行高/框高” 比例相当
+    n = max(1, math.ceil(math.sqrt(adv * box_h / (line_h * box_w))))
+    pt = base_pt * min(box_h / (n * line_h), box_w * n / adv)
+    pt = max(lo, min(pt, hi))
+
+    # 实测校验：放不下则每次缩 10%，最多 2 次
+    test_rect = QtCore.QRect(0, 0, box_w, 10_000)
+    for retry in range(3):
+        test_font.setPointSizeF(pt)
+        br = QtGui.QFontMetrics(test_font).boundingRect(test_rect, _TEXT_FLAGS, text)
+        if (br.height() <= box_h and br.width() <= box_w) or pt <= lo or retry == 2:
+            break
+        pt = max(lo, pt * 0.9)
+    return float(pt)
+
+
+@functools.lru_cache(maxsize=64)
+def _pick_radius_cached(m11: float, m22: float, m12: float, m21: float, px: float) -> float:
+    """屏幕 px → 场景长度；只与视图变换的线性部分有关，按其分量缓存。"""
+    # QTransform.inverted() 在 PySide6 返回 (inv, ok)
+    inv, ok = QtGui.QTransform(m11, m12, m21, m22, 0.0, 0.0).inverted()
+    if not ok:
+        return px
+    # 把一个 px x px 的屏幕矩形映射到场景，取其宽作为命中半径
+    rect_in_scene = inv.mapRect(QtCore.QRectF(0.0, 0.0, px, px))
+    # 最小兜底，避免过小导致难命中
+    return max(2.0, rect_in_scene.width())
+
+
+# 徽标字体/文字宽度：字号固定，按 (字体族, 字号[, 文字]) 缓存；返回的 QFont 只读共享
+@functools.lru_cache(maxsize=256)
+def _badge_font(family: str, pt: float) -> QtGui.QFont:
+    f = QtGui.QFont(family)
+    f.setBold(True)
+    f.setPointSizeF(pt)
+    return f
+
+@functools.lru_cache(maxsize=256)
+def _badge_text_width(family: str, pt: float, text: str) -> float:
+    return QtGui.QFontMetricsF(_badge_font(family, pt)).tightBoundingRect(text).width()
+
+
+# 徽标序号文字：内容只有少量数字串，预排版后所有图元共享
+_BADGE_TEXT_CACHE: Dict[Tuple[str, str], QtGui.QStaticText] = {}
+
+def _badge_static_text(text: str, font: QtGui.QFont) -> QtGui.QStaticText:
+    key = (text, font.key())
+    st = _BADGE_TEXT_CACHE.get(key)
+    if st is None:
+        st = QtGui.QStaticText(text)
+        st.setTextFormat(QtCore.Qt.PlainText)
+        st.prepare(QtGui.QTransform(), font)
+        _BADGE_TEXT_CACHE[key] = st
+    return st
+
+
+_BADGE_PT = 26.0      # 徽标固定字号
+_BADGE_MARGIN = 2.0   # 预渲染位图四周留白（白描边外沿）
+
+def _badge_size(family: str, text: str, d: float) -> Tuple[float, float]:
+    """徽标胶囊尺寸：高度稍大，宽度随文字自适应。"""
+    h = d * 1.2                        # 高度稍大一点
+    hpad = max(8.0, d * 0.22)
+    w = max(d, _badge_text_width(family, _BADGE_PT, text) + 2 * hpad)
+    return w, h
+
+@functools.lru_cache(maxsize=256)
+def _badge_pixmap(text: str, d: float, family: str, scale: float) -> QtGui.QPixmap:
+    """
+    预渲染序号徽标：红色渐变 + 白描边 + 白字(带阴影)。
+    scale = 屏幕像素/逻辑单位，作为位图 devicePixelRatio，按逻辑尺寸绘制时 1:1 出像素。
+    """
+    w, h = _badge_size(family, text, d)
+    m = _BADGE_MARGIN
+    pm = QtGui.QPixmap(max(1, math.ceil((w + 2*m) * scale)), max(1, math.ceil((h + 2*m) * scale)))
+    pm.setDevicePixelRatio(scale)
+    pm.fill(QtCore.Qt.transparent)
+
+    badge = QtCore.QRectF(m, m, w, h)
+    f = _badge_font(family, _BADGE_PT)
+    p = QtGui.QPainter(pm)
+    p.setRenderHint(QtGui.QPainter.Antialiasing, True)
+
+    # ---- 背景红渐变 + 白描边 ----
+    grad = QtGui.QLinearGradient(badge.left(), badge.center().y(), badge.right(), badge.center().y())
+    grad.setColorAt(0.0, QtGui.QColor("#b30000"))
+    grad.setColorAt(0.5, QtGui.QColor("#ff4d4f"))
+    grad.setColorAt(1.0, QtGui.QColor("#b30000"))
+    p.setBrush(QtGui.QBrush(grad))
+    p.setPen(QtGui.QPen(QtGui.QColor("#ffffff"), 2))
+    r = h * 0.5
+    p.drawRoundedRect(badge, r, r)
+
+    # ---- 白字 + 黑影 ----
+    p.setFont(f)
+    st = _badge_static_text(text, f)
+    sz = st.size()
+    tx = badge.center().x() - sz.width() * 0.5
+    ty = badge.center().y() - sz.height() * 0.5
+    shadow_off = max(1.0, d * 0.03)
+    p.setPen(QtGui.QPen(QtGui.QColor(0, 0, 0, 180)))
+    p.drawStaticText(QtCore.QPointF(tx + shadow_off, ty + shadow_off), st)
+    p.setPen(QtGui.QPen(QtCore.Qt.white))
+    p.drawStaticText(QtCore.QPointF(tx, ty), st)
+    p.end()
+    return pm
+
+
 # ==============================================================
 # 3) 视图层：DifferenceItem（轻薄视图，仅缓存上一帧尺寸用于 prepareGeometryChange）
 # ==============================================================
@@ -178,13 +421,43 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
     PEN_CIRCLE    = QtGui.QPen(QtGui.QColor('#00c853'), 3)
     PEN_CIRCLE_HL = QtGui.QPen(QtGui.QColor('#00e676'), 4)
     BRUSH_CIRC_HL = QtGui.QBrush(QtGui.QColor(0, 230, 118, 30))
+    PEN_CIRCLE_GLOW_EDGE = QtGui.QPen(QtGui.QColor('#00e676'), 2.5)   # 高亮圆外沿
+    BRUSH_CIRCLE_GLOW    = QtGui.QBrush(QtGui.QColor(0, 230, 118, 40)) # 高亮圆光晕
 
     HANDLE_BR     = QtGui.QBrush(QtGui.QColor('#d32f2f'))
     HANDLE_PEN    = QtGui.QPen(QtCore.Qt.NoPen)
 
     HANDLE_SIZE    = 9.0
+    # 角把手：圆头粗笔画点，一次 drawPoints 画完 4 个
+    HANDLE_DOT_PEN = QtGui.QPen(QtGui.QBrush(QtGui.QColor('#d32f2f')), HANDLE_SIZE,
+                                QtCore.Qt.SolidLine, QtCore.Qt.RoundCap)
+    HANDLE_DOT_PEN_CLICK = QtGui.QPen(QtGui.QBrush(QtGui.QColor('#1976d2')), HANDLE_SIZE,
+                                      QtCore.Qt.SolidLine, QtCore.Qt.RoundCap)
     EDGE_THRESH    = 8.0
+    # 绘制缓存：False=DeviceCoordinateCache（默认），True=ItemCoordinateCache
+    USE_ITEM_CACHE = False
+    # 细节层级阈值（屏幕像素 / 场景单位）
+    LOD_OUTLINE_ONLY = 0.05
+    BADGE_MIN_PX     = 6.0   # 徽标屏幕尺寸下限
+    TEXT_MIN_PX      = 4.0   # 文字框屏幕高度下限
+    HANDLE_MIN_PX    = 2.0   # 把手屏幕尺寸下限
     CORNER_THRESH  = 12.0
+    CORNER_THRESH_SQ = CORNER_THRESH * CORNER_THRESH
+    RECT_REACH       = max(CORNER_THRESH, EDGE_THRESH)
+
+    # 命中结果 → 光标 查表（替代逐级 if 分支）
+    CURSOR_BY_CLICK_HANDLE = {
+        "L": _CUR_HOR,   "R": _CUR_HOR,
+        "T": _CUR_VER,   "B": _CUR_VER,
+        "TL": _CUR_FDIAG, "BR": _CUR_FDIAG,
+        "TR": _CUR_BDIAG, "BL": _CUR_BDIAG,
+    }
+    CURSOR_BY_CORNER = (_CUR_FDIAG, _CUR_BDIAG,
+                        _CUR_FDIAG, _CUR_BDIAG)  # TL, TR, BR, BL
+    CURSOR_BY_EDGE = {
+        "L": _CUR_HOR, "R": _CUR_HOR,
+        "T": _CUR_VER, "B": _CUR_VER,
+    }
 
     class Mode:
         NONE=0; MOVE=1; RESIZE_CORNER=2; RESIZE_EDGE=3; DRAG_CIRCLE=4
@@ -202,13 +475,17 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
 
         # 文字颜色与缓存
         self._text_color = QtGui.QColor('#333') if color is None else QtGui.QColor(color)
+        self._text_pen = QtGui.QPen(self._text_color)
         self._text_font = QtGui.QFont()
-        self._text_cache_key: Optional[Tuple[int, int, str]] = None
-        self._text_cached_pt: float = 10.0
+        # 预排版文字缓存：键 (label, pt, w, h)
+        self._static_text: Optional[QtGui.QStaticText] = None
+        self._static_text_key: Optional[Tuple[str, float, int, int]] = None
 
         # UI/交互状态（与业务无关）
         self._extern_selected: bool = False
         self._selected_alpha: int = 200
+        # 选中态填充画刷缓存：键 是否高亮；alpha 变化时整体清空（见 setSelectedAlpha）
+        self._brush_cache: Dict[bool, QtGui.QBrush] = {}
         self._hl_rect   = False
         self._hl_circle = False
         self._hl_click  = False
@@ -216,11 +493,16 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
         self._mode = self.Mode.NONE
         self._drag_corner = -1
         self._edge_code = ''  # 'L','R','T','B'
-        self._press_tl_scene = QtCore.QPointF()
-        self._press_br_scene = QtCore.QPointF()
-        self._anchor_scene   = QtCore.QPointF()
+        # 拉伸按下快照（场景坐标，纯 float，拖动热路径免 QPointF 构造）
+        self._press_tl_scene: Tuple[float, float] = (0.0, 0.0)
+        self._press_br_scene: Tuple[float, float] = (0.0, 0.0)
+        self._anchor_scene:   Tuple[float, float] = (0.0, 0.0)
         self._press_center   = QtCore.QPointF()  # 圆心按下快照（局部）
         self._is_resizing    = False
+        # 拖动写回节流：按 model setter 暂存最新几何，经场景共用的 0ms 合并器写回
+        self._pending_geom: Dict[object, tuple] = {}
+        # 点击区域拖动：首个未刷新修改前的绘制范围（局部刷新用）
+        self._pending_click_dirty: Optional[QtCore.QRectF] = None
 
         # 可见性（内部控制，默认全开）
         self._show_click = True
@@ -228,21 +510,40 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
         self._show_circle = True
         self._show_label = True
 
+        # 场景边界 (l, t, r, b) 缓存：进入/离开场景时刷新，拖动热路径直接复用
+        self._scene_bounds: Tuple[float, float, float, float] = _NO_SCENE_BOUNDS
+
+        # 点击区域局部几何缓存（键：model.revision + 场景边界）
+        self._click_local_key: Optional[tuple] = None
+        self._click_local: Optional[Tuple[QtCore.QPointF, float, float, str]] = None
+        self._circle_rect: Optional[QtCore.QRectF] = None
+        self._recompute_circle_rect()
         self._cached_bounds_rect = self._compute_bounds_union()
+        self._bounds_key: Optional[tuple] = None
+        self._cached_shape: Optional[QtGui.QPainterPath] = None
+        self._shape_key: Optional[tuple] = None
+        self._bubble_path = QtGui.QPainterPath()
+        self._bubble_key: Optional[tuple] = None
 
         # 仅缓存“上一帧尺寸”
         self._cached_rect_size = QtCore.QSizeF(
             max(MIN_RECT_SIZE, float(self.model.width)),
             max(MIN_RECT_SIZE, float(self.model.height))
         )
+        self._corner_pts = QtGui.QPolygonF()
+        self._text_rect = QtCore.QRectF()
+        self._rebuild_rect_caches()
         self._apply_enabled_flags()   # ★ 新增：同步拖动/拉伸开关
         # 性能/Flags
-        self.setCacheMode(QtWidgets.QGraphicsItem.NoCache)
-        self.setFlag(QtWidgets.QGraphicsItem.ItemSendsGeometryChanges, True)   # 以便截获移动
+        self._apply_cache_mode()
         self.setAcceptedMouseButtons(QtCore.Qt.LeftButton)
         self.setAcceptHoverEvents(True)
-        self.setCursor(QtCore.Qt.OpenHandCursor)
-        self.setZValue(1)
+        # 让 option.exposedRect 给出真实脏区（否则恒为整个 boundingRect）
+        self.setFlag(QtWidgets.QGraphicsItem.ItemUsesExtendedStyleOption, True)
+        self._current_cursor = None   # 当前已设置的光标，未变化时不再下发
+        self._set_cursor(_CUR_OPEN)
+        self._z: int = 1
+        self.setZValue(self._z)
 
         # 初始位置
         self.setPos(self.model.x, self.model.y)
@@ -254,8 +555,12 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
 
     # -------------------- 派生值（现算现用） --------------------
     def _radius_from_model(self) -> float:
-        lvl = max(1, min(int(self.model.hint_level), len(RADIUS_LEVELS)))
-        return float(RADIUS_LEVELS[lvl - 1])
+        return float(RADIUS_LEVELS[self._level_from_model() - 1])
+
+    def _level_from_model(self) -> int:
+        """model.hint_level 夹到 [1, _MAX_LEVEL]。"""
+        lvl = self.model.hint_level
+        return 1 if lvl < 1 else (_MAX_LEVEL if lvl > _MAX_LEVEL else lvl)
 
     def _current_rect_local(self) -> QtCore.QRectF:
         """本地坐标下的矩形：始终 (0,0,w,h)"""
@@ -268,9 +573,7 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
         rect = self._current_rect_local()
         w, h = rect.width(), rect.height()
         r = self._radius_from_model()
-
-        scene = self.scene()
-        scene_rect = scene.sceneRect() if scene else QtCore.QRectF(-1e6, -1e6, 2e6, 2e6)
+        sl, st, sr, sb = self._scene_bounds
 
         # 若未设定绝对坐标，则默认用“矩形中心的场景坐标”
         if self.model.cx < 0 or self.model.cy < 0:
@@ -280,8 +583,8 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
             cx_scene = float(self.model.cx)
             cy_scene = float(self.model.cy)
         # 夹紧到场景，保证整圆可见（如不想限制可移除这段）
-        cx_scene = max(scene_rect.left() + r,  min(cx_scene, scene_rect.right()  - r))
-        cy_scene = max(scene_rect.top()  + r,  min(cy_scene, scene_rect.bottom() - r))
+        cx_scene = max(sl + r, min(cx_scene, sr - r))
+        cy_scene = max(st + r, min(cy_scene, sb - r))
 
         cx_local = cx_scene - self.model.x
         cy_local = cy_scene - self.model.y
@@ -294,6 +597,8 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
     def _apply_enabled_flags(self):
         movable = self._rect_interactions_allowed()
         self.setFlag(QtWidgets.QGraphicsItem.ItemIsMovable, movable)
+        # 仅可拖动时才需要截获移动做夹紧/回写；不可动时关掉，免去每次 setPos 的 Python itemChange 往返
+        self.setFlag(QtWidgets.QGraphicsItem.ItemSendsGeometryChanges, movable)
         # （可选）禁用时降低红框高亮感
         if not movable:
             self._hl_rect = False
@@ -302,7 +607,15 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
         """
         返回 (局部中心, a, b, shape)；不对中心和半轴做红框约束。
         回退：若参数缺省/无效，使用红框中心和半轴；圆强制 a==b。
+        结果按 (model.revision, 场景边界) 缓存；返回的 QPointF 只读使用。
         """
+        key = (self.model.revision, self._scene_bounds)
+        if self._click_local_key != key:
+            self._click_local = self._compute_click_local()
+            self._click_local_key = key
+        return self._click_local
+
+    def _compute_click_local(self) -> Tuple[QtCore.QPointF, float, float, str]:
         rect = self._current_rect_local()
         w, h = rect.width(), rect.height()
 
@@ -330,7 +643,8 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
         # 半轴最小值兜底（不做上限）
         a = max(1.0, float(a))
         b = max(1.0, float(b))
-        cx_local, cy_local = self._clamp_center_to_scene(local_cx, local_cy, a, b)
+        cx_local, cy_local = self._clamp_center_to_scene(local_cx, local_cy, a, b,
+                                                         scene_bounds=self._scene_bounds)
         return QtCore.QPointF(cx_local, cy_local), float(a), float(b), shape
 
 
@@ -365,15 +679,9 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
 
     # -------------------- 绘制 --------------------
     # —— 小徽标绘制工具 —— #
-    def _draw_badge(self, p: QtGui.QPainter, box: QtCore.QRectF, text: str,
-                corner: str = "lt", d: float = 60.0, pad: float = 6.0):
-        """
-        固定字号 26 的序号徽标：红色渐变 + 白描边 + 白字(带阴影)。
-        高度稍大，宽度随文字自适应（胶囊形）。
-        """
-        if not text:
-            return
-
+    def _badge_rect(self, box: QtCore.QRectF, text: str, corner: str = "lt",
+                    d: float = 60.0, pad: float = 6.0) -> Tuple[QtCore.QRectF, QtGui.QFont]:
+        """徽标外框（局部坐标）与所用字体；绘制与局部刷新共用。"""
         # ---- 定位角落 ----
         if corner == "rt":
             x = box.right()  - d - pad; y = box.top()    + pad
@@ -384,58 +692,60 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
         else:  # "lt"
             x = box.left()   + pad;     y = box.top()    + pad
 
-        # ---- 固定字号 26，测量文字 ----
-        f = QtGui.QFont(self._text_font)
-        f.setBold(True)
-        f.setPointSizeF(26)
-        fm = QtGui.QFontMetricsF(f)
-        br = fm.tightBoundingRect(text)
-
-        # ---- 内边距与尺寸 ----
-        h = d * 1.2                        # 高度稍大一点
-        hpad = max(8.0, d * 0.22)
-        w = max(d, br.width() + 2 * hpad)
-        badge = QtCore.QRectF(x, y, w, h)
+        family = self._text_font.family()
+        w, h = _badge_size(family, text, d)
+        return QtCore.QRectF(x, y, w, h), _badge_font(family, _BADGE_PT)
 
-        p.save()
-        p.setRenderHint(QtGui.QPainter.Antialiasing, True)
-
-        # ---- 背景红渐变 + 白描边 ----
-        grad = QtGui.QLinearGradient(badge.center().x() - w/2, badge.center().y(),
-                                    badge.center().x() + w/2, badge.center().y())
-        grad.setColorAt(0.0, QtGui.QColor("#b30000"))
-        grad.setColorAt(0.5, QtGui.QColor("#ff4d4f"))
-        grad.setColorAt(1.0, QtGui.QColor("#b30000"))
-        p.setBrush(QtGui.QBrush(grad))
-        p.setPen(QtGui.QPen(QtGui.QColor("#ffffff"), 2))
-        r = h * 0.5
-        p.drawRoundedRect(badge, r, r)
-
-        # ---- 白字 + 黑影 ----
-        p.setFont(f)
-        shadow_off = max(1.0, d * 0.03)
-        p.setPen(QtGui.QPen(QtGui.QColor(0, 0, 0, 180)))
-        p.drawText(badge.translated(shadow_off, shadow_off), QtCore.Qt.AlignCenter, text)
-        p.setPen(QtGui.QPen(QtCore.Qt.white))
-        p.drawText(badge, QtCore.Qt.AlignCenter, text)
+    def _click_paint_rect(self) -> QtCore.QRectF:
+        """点击区域的实际绘制范围：区域 + 手柄/高亮描边外扩 + 序号徽标。"""
+        c, a, b, _ = self._current_click_local()
+        click_rect = QtCore.QRectF(c.x()-a, c.y()-b, 2*a, 2*b)
+        m = self.HANDLE_SIZE
+        badge, _ = self._badge_rect(click_rect, str(self._ordinal), "lt", 20.0, 4.0)
+        return click_rect.adjusted(-m, -m, m, m).united(badge.adjusted(-2, -2, 2, 2))
 
-        p.restore()
+    def _draw_badge(self, p: QtGui.QPainter, box: QtCore.QRectF, text: str,
+                corner: str = "lt", d: float = 60.0, pad: float = 6.0, lod: float = 1.0):
+        """
+        固定字号 26 的序号徽标：红色渐变 + 白描边 + 白字(带阴影)。
+        高度稍大，宽度随文字自适应（胶囊形）。
+        lod 为当前细节层级；徽标屏幕尺寸小于 BADGE_MIN_PX 时不画。
+        """
+        if not text or lod * d < self.BADGE_MIN_PX:
+            return
+        badge, _ = self._badge_rect(box, text, corner, d, pad)
+        # 按“屏幕像素/场景单位”取预渲染位图：保留两位小数，与实际缩放相差不到 1%，
+        # 贴图近乎 1:1 不糊；lod 只随窗口尺寸变化，缓存仍可命中
+        scale = max(0.01, round(lod * p.device().devicePixelRatioF(), 2))
+        pm = _badge_pixmap(text, d, self._text_font.family(), scale)
+        p.drawPixmap(QtCore.QPointF(badge.x() - _BADGE_MARGIN, badge.y() - _BADGE_MARGIN), pm)
 
     def paint(self, p: QtGui.QPainter, option, widget=None):
-        p.setRenderHints(QtGui.QPainter.RenderHint(0))
+        # 渲染提示已在 ImageView 统一关闭，这里不再逐帧清除
         rect = self._current_rect_local()
 
+        # 细节层级：缩得很小时只画轮廓；文字/徽标/把手各按其屏幕尺寸决定是否绘制
+        lod = option.levelOfDetailFromTransform(p.worldTransform())
+        if lod < self.LOD_OUTLINE_ONLY:
+            if self._show_rect:
+                p.setPen(self.PEN_RECT_HL if self._hl_rect else self.PEN_RECT)
+                p.setBrush(QtCore.Qt.NoBrush)
+                p.drawRect(rect)
+            return
+        show_handles = lod * self.HANDLE_SIZE >= self.HANDLE_MIN_PX
+        # 只重画脏区涉及的部分（外扩把手尺寸，覆盖描边与角把手）
+        exposed = option.exposedRect
+        m = self.HANDLE_SIZE
+        rect_dirty = exposed.intersects(rect.adjusted(-m, -m, m, m))
+
         # 矩形
-        if self._show_rect:
+        if self._show_rect and rect_dirty:
             if self._hl_rect:
                 pen = self.PEN_RECT_HL; base_brush = self.BRUSH_RECT_HL
             else:
                 pen = self.PEN_RECT;    base_brush = self.BRUSH_RECT
             p.setPen(pen)
-            col = QtGui.QColor(base_brush.color())
-            if self._extern_selected:
-                col.setAlpha(min(255, self._selected_alpha))
-            p.setBrush(QtGui.QBrush(col))
+            p.setBrush(self._rect_brush(base_brush) if self._extern_selected else base_brush)
             p.drawRect(rect)
 
         # 本侧显示（沿用 up/down 逻辑）
@@ -443,19 +753,20 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
 
         # 圆
         if self._show_circle:
-            c, r = self._current_circle_local()             # 先算
-            lvl = max(1, min(int(self.model.hint_level), len(RADIUS_LEVELS)))
+            lvl = self._level_from_model()
             pm  = CirclePixmapProvider.instance().get(lvl)
             bbox = self._circle_pixmap_bbox()
+            if bbox and not exposed.intersects(bbox.adjusted(-8.0, -8.0, 8.0, 8.0)):
+                bbox = None                                 # 圆及其光晕都不在脏区内
             if bbox:
                 p.drawPixmap(bbox.topLeft(), pm)            # PNG 按 bbox 放置
-                self._draw_badge(p, bbox, str(self._ordinal), corner="lt", d=20.0, pad=4.0)
+                self._draw_badge(p, bbox, str(self._ordinal), corner="lt", d=20.0, pad=4.0, lod=lod)
 
-            if self._hl_circle:
-                p.save()
+            if bbox and self._hl_circle:
+                # 渲染提示默认全关：仅此处临时开抗锯齿，画完即关，不走 save/restore
                 p.setRenderHint(QtGui.QPainter.Antialiasing, True)
                 # A) 外沿描边
-                p.setPen(QtGui.QPen(QtGui.QColor('#00e676'), 2.5))
+                p.setPen(self.PEN_CIRCLE_GLOW_EDGE)
                 p.setBrush(QtCore.Qt.NoBrush)
                 p.drawEllipse(bbox)
                 # B) 光晕环（外扩一圈）
@@ -465,35 +776,34 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
                 path_inner = QtGui.QPainterPath(); path_inner.addEllipse(bbox)
                 ring = path_outer.subtracted(path_inner)
                 p.setPen(QtCore.Qt.NoPen)
-                p.setBrush(QtGui.QColor(0, 230, 118, 40))
+                p.setBrush(self.BRUSH_CIRCLE_GLOW)
                 p.drawPath(ring)
-                p.restore()
+                p.setRenderHint(QtGui.QPainter.Antialiasing, False)
 
         # 文本：居中 + 自动换行 + 字号自适配
         label = (self.model.label or "").strip()
-        if visible_for_side and self._show_label and label:
-            rect_local = self._current_rect_local()
-            # 给文字留一点内边距
-            pad = max(4.0, min(rect_local.width(), rect_local.height()) * 0.06)
-            text_rect = rect_local.adjusted(pad, pad, -pad, -pad)
+        if (visible_for_side and self._show_label and label
+                and lod * self._text_rect.height() >= self.TEXT_MIN_PX
+                and exposed.intersects(self._text_rect)):
+            text_rect = self._text_rect
             # 自适应字号
-            pt = self._compute_fitting_pointsize(text_rect.width(), text_rect.height(), label)
+            pt = _fit_pt(self._text_font.family(), self._text_font.weight(),
+                         int(text_rect.width()), int(text_rect.height()), label)
             self._text_font.setPointSizeF(pt)
+            st = self._get_static_text(label, pt, text_rect.width(), text_rect.height())
             p.setFont(self._text_font)
-            p.setPen(QtGui.QPen(self._text_color))
-            flags = QtCore.Qt.AlignCenter | QtCore.Qt.TextWordWrap
-            p.drawText(text_rect, flags, label)
+            p.setPen(self._text_pen)
+            # 垂直居中（水平居中由 QTextOption 负责）
+            dy = max(0.0, (text_rect.height() - st.size().height()) / 2.0)
+            p.drawStaticText(QtCore.QPointF(text_rect.left(), text_rect.top() + dy), st)
 
         # 角把手
-        if self._show_rect:
-            hs = self.HANDLE_SIZE
-            p.setPen(self.HANDLE_PEN); p.setBrush(self.HANDLE_BR)
-            tl = rect.topLeft(); tr = rect.topRight()
-            br = rect.bottomRight(); bl = rect.bottomLeft()
-            for ptc in (tl, tr, br, bl):
-                p.drawEllipse(QtCore.QRectF(ptc.x()-hs/2, ptc.y()-hs/2, hs, hs))
-
-        if self.model.click_customized and self._show_click:
+        if show_handles and self._show_rect and rect_dirty:
+            p.setPen(self.HANDLE_DOT_PEN)
+            p.drawPoints(self._corner_pts)
+
+        if (self.model.click_customized and self._show_click
+                and exposed.intersects(self._click_paint_rect())):
             c, a, b, shape = self._current_click_local()
             click_rect = QtCore.QRectF(c.x()-a, c.y()-b, 2*a, 2*b)
             p.setPen(self.PEN_CLICK if not self._hl_click else self.PEN_CLICK_HL)
@@ -501,13 +811,33 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
             if shape == "rect":
                 p.drawRect(click_rect)
             else:  # ellipse
-                p.drawEllipse(QtCore.QRectF(c.x()-a, c.y()-b, 2*a, 2*b))
-            self._draw_badge(p, click_rect, str(self._ordinal), corner="lt", d=20.0, pad=4.0)
-
-            hs = self.HANDLE_SIZE
-            p.setPen(self.HANDLE_PEN); p.setBrush(self.HANDLE_BR_CLICK)
-            for ptc in self._click_handles(c, a, b, shape).values():
-                p.drawEllipse(QtCore.QRectF(ptc.x()-hs/2, ptc.y()-hs/2, hs, hs))
+                p.drawEllipse(c, a, b)
+            self._draw_badge(p, click_rect, str(self._ordinal), corner="lt", d=20.0, pad=4.0, lod=lod)
+            if show_handles:
+                p.setPen(self.HANDLE_DOT_PEN_CLICK)
+                p.drawPoints(QtGui.QPolygonF(list(self._click_handles(c, a, b, shape).values())))
+
+    def _rebuild_rect_caches(self):
+        """矩形尺寸变化时重建：四角点、文字框（局部坐标）。"""
+        w = self._cached_rect_size.width(); h = self._cached_rect_size.height()
+        self._corner_pts = QtGui.QPolygonF([
+            QtCore.QPointF(0.0, 0.0), QtCore.QPointF(w, 0.0),
+            QtCore.QPointF(w, h),     QtCore.QPointF(0.0, h),
+        ])
+        # 文字框：给文字留一点内边距
+        pad = max(4.0, min(w, h) * 0.06)
+        self._text_rect = QtCore.QRectF(pad, pad, w - 2*pad, h - 2*pad)
+
+    def _rect_brush(self, base_brush: QtGui.QBrush) -> QtGui.QBrush:
+        """选中态填充：在基础色上换 alpha，按是否高亮缓存复用。"""
+        key = self._hl_rect
+        brush = self._brush_cache.get(key)
+        if brush is None:
+            col = QtGui.QColor(base_brush.color())
+            col.setAlpha(min(255, self._selected_alpha))
+            brush = QtGui.QBrush(col)
+            self._brush_cache[key] = brush
+        return brush
 
     def _scene_pick_radius(self, px: float = 12.0) -> float:
         """
@@ -522,59 +852,109 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
         if not views:
             return float(px)
 
-        view = views[0]
-        # QTransform.inverted() 在 PySide6 返回 (inv, ok)
-        inv, ok = view.transform().inverted()
-        if not ok:
-            return float(px)
-
-        # 把一个 px x px 的屏幕矩形映射到场景，取其宽作为命中半径
-        rect_in_scene = inv.mapRect(QtCore.QRectF(0.0, 0.0, float(px), float(px)))
-        # 最小兜底，避免过小导致难命中
-        return max(2.0, rect_in_scene.width())
+        t = views[0].transform()
+        return _pick_radius_cached(t.m11(), t.m22(), t.m12(), t.m21(), float(px))
     
     def _compute_bounds_union(self) -> QtCore.QRectF:
-        rect = self._current_rect_local()
-        uni  = QtCore.QRectF(rect)
+        # 各部件都是规整的轴对齐矩形：直接在浮点上取 min/max，不走 QRectF.united
+        x1 = y1 = 0.0
+        x2 = max(MIN_RECT_SIZE, float(self.model.width))
+        y2 = max(MIN_RECT_SIZE, float(self.model.height))
 
         if self._show_circle:
             bbox = self._circle_pixmap_bbox()
             if bbox:
-                uni = uni.united(bbox)
+                x1 = min(x1, bbox.left());  y1 = min(y1, bbox.top())
+                x2 = max(x2, bbox.right()); y2 = max(y2, bbox.bottom())
 
         if self._show_click:
             c, a, b, _ = self._current_click_local()
-            click_rect = QtCore.QRectF(c.x()-a, c.y()-b, 2*a, 2*b)
-            uni = uni.united(click_rect)
+            cx, cy = c.x(), c.y()
+            x1 = min(x1, cx - a); y1 = min(y1, cy - b)
+            x2 = max(x2, cx + a); y2 = max(y2, cy + b)
 
         # ★ margin 取 hand-pick 半径与 8 的较大者，确保手柄泡泡也在 boundingRect 内
-        margin = max(8.0, self._scene_pick_radius(12.0))
-        return uni.adjusted(-margin, -margin, margin, margin)
+        m = max(8.0, self._scene_pick_radius(12.0))
+        return QtCore.QRectF(x1 - m, y1 - m, (x2 - x1) + 2*m, (y2 - y1) + 2*m)
+
+    def _bounds_inputs_key(self) -> tuple:
+        """_compute_bounds_union 的全部输入；不变则无需重算。"""
+        m = self.model
+        sz = self._cached_rect_size
+        cr = self._circle_rect if self._show_circle else None
+        circle_key = (cr.x(), cr.y(), cr.width(), cr.height()) if cr is not None else None
+        # 点击区域为绝对坐标，换到局部依赖 x/y 与场景边界
+        click_key = (m.x, m.y, m.click_customized, m.click_cx, m.click_cy, m.click_a, m.click_b,
+                     m.click_shape, self._scene_bounds) if self._show_click else None
+        return (sz.width(), sz.height(), circle_key, click_key, self._scene_pick_radius(12.0))
 
     def _refresh_bounds_if_needed(self):
-        old = QtCore.QRectF(self._cached_bounds_rect)
+        key = self._bounds_inputs_key()
+        if key == self._bounds_key:
+            return
+        self._bounds_key = key
+        old = self._cached_bounds_rect
         new = self._compute_bounds_union()
         if (abs(new.x()-old.x())>1e-6 or abs(new.y()-old.y())>1e-6 or
             abs(new.width()-old.width())>1e-6 or abs(new.height()-old.height())>1e-6):
             self.prepareGeometryChange()
             self._cached_bounds_rect = new
-            # 同时无效化旧+新区域，抹干净残影
-            self.update(old.united(new))
+            self._apply_cache_mode()
+            # prepareGeometryChange 已无效化旧区域并重画新区域，无需再 update
+
+    def _apply_cache_mode(self):
+        """
+        默认按设备坐标缓存（缩放后仍清晰，平移直接复用）；
+        USE_ITEM_CACHE 时改按逻辑坐标缓存，尺寸随 boundingRect 同步（适合缩放固定、频繁平移）。
+        """
+        if not self.USE_ITEM_CACHE:
+            if self.cacheMode() != QtWidgets.QGraphicsItem.DeviceCoordinateCache:
+                self.setCacheMode(QtWidgets.QGraphicsItem.DeviceCoordinateCache)
+            return
+        br = self._cached_bounds_rect
+        size = QtCore.QSize(int(math.ceil(br.width())) + 8, int(math.ceil(br.height())) + 8)
+        self.setCacheMode(QtWidgets.QGraphicsItem.ItemCoordinateCache, size)
+
+    def _invalidate_geom_cache(self):
+        self._cached_shape = None
+        self._shape_key = None
 
     def boundingRect(self) -> QtCore.QRectF:
-        return QtCore.QRectF(self._cached_bounds_rect)
-    
+        # 只读使用：_cached_bounds_rect 每次整体替换，不会原地修改
+        return self._cached_bounds_rect
+
     def shape(self) -> QtGui.QPainterPath:
+        # 键含拾取半径：视图缩放变化时自动重建
+        if self._show_click:
+            pick_edge   = self._scene_pick_radius(16.0)
+            pick_handle = self._scene_pick_radius(12.0)
+            c, a, b, cshape = self._current_click_local()
+            click_key = (round(c.x(), 3), round(c.y(), 3), round(a, 3), round(b, 3), cshape,
+                         round(pick_edge, 3), round(pick_handle, 3))
+        else:
+            pick_edge = pick_handle = 0.0
+            click_key = None
+        sz = self._cached_rect_size
+        bbox = self._circle_pixmap_bbox()
+        circle_key = (round(bbox.x(), 3), round(bbox.y(), 3),
+                      round(bbox.width(), 3), round(bbox.height(), 3)) if bbox else None
+        key = (round(sz.width(), 3), round(sz.height(), 3), circle_key, click_key)
+        if self._cached_shape is None or key != self._shape_key:
+            self._cached_shape = self._build_shape(pick_edge, pick_handle)
+            self._shape_key = key
+        return QtGui.QPainterPath(self._cached_shape)
+
+    def _build_shape(self, pick_edge: float, pick_handle: float) -> QtGui.QPainterPath:
+        # 多子路径直接追加 + 非零环绕填充：contains() 即为并集，免去 united() 的布尔裁剪
         path = QtGui.QPainterPath()
+        path.setFillRule(QtCore.Qt.WindingFill)
         rect = self._current_rect_local()
         path.addRect(rect)
 
         if self._show_circle:
             bbox = self._circle_pixmap_bbox()
             if bbox:
-                circ = QtGui.QPainterPath()
-                circ.addRect(bbox)  # 用 PNG 的外接矩形，而不是几何圆
-                path = path.united(circ)
+                path.addRect(bbox)  # 用 PNG 的外接矩形，而不是几何圆
 
         if self._show_click:
             c, a, b, shape = self._current_click_local()
@@ -583,51 +963,48 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
             if shape == "rect":
                 click.addRect(click_rect)
             else:
-                click.addEllipse(click_rect)
+                click.addEllipse(c, a, b)
 
             # 椭圆边沿粗描边（整条边易点）
             stroker = QtGui.QPainterPathStroker()
-            stroker.setWidth(self._scene_pick_radius(16.0))
+            stroker.setWidth(pick_edge)
             fat_edge = stroker.createStroke(click)
 
             # ★ 关键：把 8 个手柄“泡泡”并入 shape（角点在椭圆外也能接收事件）
-            pick = self._scene_pick_radius(12.0)
-            handles = self._click_handles(c, a, b, shape)
-            handle_path = QtGui.QPainterPath()
-            for pt in handles.values():
-                handle_path.addEllipse(QtCore.QRectF(pt.x()-pick, pt.y()-pick, 2*pick, 2*pick))
+            handle_path = self._handle_bubble_path(c, a, b, shape, pick_handle)
 
-            path = path.united(click).united(fat_edge).united(handle_path)
+            path.addPath(click)
+            path.addPath(fat_edge)
+            path.addPath(handle_path)
 
         return path
 
-    # ====== 文本字号自适配 ======
-    def _compute_fitting_pointsize(self, box_w: float, box_h: float, text: str) -> float:
-        if box_w <= 1 or box_h <= 1 or not text:
-            return 10.0
-        key = (int(box_w), int(box_h), text)
-        if self._text_cache_key == key:
-            return float(self._text_cached_pt)
-
-        lo, hi = 8.0, max(14.0, box_h * 0.9)
-        best = lo
-        test_font = QtGui.QFont(self._text_font)
-        test_rect = QtCore.QRect(0, 0, int(box_w), 10_000)
-        flags = QtCore.Qt.AlignCenter | QtCore.Qt.TextWordWrap | QtCore.Qt.TextWrapAnywhere
-
-        while hi - lo > 0.5:
-            mid = (lo + hi) / 2.0
-            test_font.setPointSizeF(mid)
-            fm = QtGui.QFontMetrics(test_font)
-            br = fm.boundingRect(test_rect, flags, text)
-            if br.height() <= box_h and br.width() <= box_w:
-                best = mid; lo = mid
-            else:
-                hi = mid
-
-        self._text_cache_key = key
-        self._text_cached_pt = float(best)
-        return float(best)
+    def _handle_bubble_path(self, c: QtCore.QPointF, a: float, b: float, shape: str,
+                            pick: float) -> QtGui.QPainterPath:
+        """8 个手柄“泡泡”路径：仅在点击区域几何或拾取半径变化时重建。"""
+        key = (c.x(), c.y(), a, b, shape, pick)
+        if self._bubble_key != key:
+            path = QtGui.QPainterPath()
+            for pt in self._click_handles(c, a, b, shape).values():
+                path.addEllipse(pt, pick, pick)
+            self._bubble_path = path
+            self._bubble_key = key
+        return self._bubble_path
+
+    # ====== 文本预排版缓存 ======
+    def _get_static_text(self, label: str, pt: float, box_w: float, box_h: float) -> QtGui.QStaticText:
+        key = (label, pt, int(box_w), int(box_h))
+        if self._static_text is not None and self._static_text_key == key:
+            return self._static_text
+        st = QtGui.QStaticText(label)
+        opt = QtGui.QTextOption(_ALIGN_CENTER)
+        opt.setWrapMode(QtGui.QTextOption.WrapAtWordBoundaryOrAnywhere)
+        st.setTextOption(opt)
+        st.setTextWidth(box_w)
+        st.prepare(QtGui.QTransform(), self._text_font)
+        self._static_text = st
+        self._static_text_key = key
+        return st
 
     # -------------------- hover：高亮 + 指针 --------------------
     def hoverMoveEvent(self, e: QtWidgets.QGraphicsSceneHoverEvent) -> None:
@@ -640,36 +1017,33 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
         if self._can_hit_click():
             hcode = self._hit_click_handle(pos)
             if hcode:
-                if hcode in ("L","R"): self.setCursor(QtCore.Qt.SizeHorCursor)
-                elif hcode in ("T","B"): self.setCursor(QtCore.Qt.SizeVerCursor)
-                elif hcode in ("TL", "BR"): self.setCursor(QtCore.Qt.SizeFDiagCursor)
-                else : self.setCursor(QtCore.Qt.SizeBDiagCursor)
+                self._set_cursor(self.CURSOR_BY_CLICK_HANDLE.get(hcode, _CUR_BDIAG))
                 self._set_hover_state(rect_hl=False, circ_hl=False, click_hl=True); return
 
             # 点击区域本体
             if self._hit_click_inside(pos):
-                self.setCursor(QtCore.Qt.OpenHandCursor)
+                self._set_cursor(_CUR_OPEN)
                 self._set_hover_state(rect_hl=False, circ_hl=False, click_hl=True); return
             
         # 圆
         if self._show_circle and self._hit_circle(pos):
-            self.setCursor(QtCore.Qt.OpenHandCursor)
+            self._set_cursor(_CUR_OPEN)
             self._set_hover_state(rect_hl=False, circ_hl=True, click_hl=False)
             return
         
-        # 矩形
+        # 矩形：先做外扩包围盒粗筛，离框较远时跳过角/边判定
         # 角优先
-        if self._can_hit_rect():
+        if self._near_rect(pos) and self._can_hit_rect():
             corner = self._hit_corner(rect, pos)
             if corner >= 0:
-                self.setCursor(QtCore.Qt.SizeFDiagCursor if corner in (0, 2) else QtCore.Qt.SizeBDiagCursor)
+                self._set_cursor(self.CURSOR_BY_CORNER[corner])
                 self._set_hover_state(rect_hl=True, circ_hl=False, click_hl=False)
                 return
 
             # 边
             edge = self._hit_edge(rect, pos)
             if edge:
-                self.setCursor(QtCore.Qt.SizeHorCursor if edge in ('L','R') else QtCore.Qt.SizeVerCursor)
+                self._set_cursor(self.CURSOR_BY_EDGE[edge])
                 self._set_hover_state(rect_hl=True, circ_hl=False, click_hl=False)
                 return
 
@@ -677,19 +1051,25 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
 
             # 矩形内部也高亮
             if self._show_rect and rect.contains(pos):
-                self.setCursor(QtCore.Qt.OpenHandCursor)
+                self._set_cursor(_CUR_OPEN)
                 self._set_hover_state(rect_hl=True, circ_hl=False, click_hl=False)
                 return
 
-        # self.setCursor(QtCore.Qt.OpenHandCursor)
+        # 基类 hoverMoveEvent 为空实现，不再转调
         self._set_hover_state(rect_hl=False, circ_hl=False, click_hl=False)
-        super().hoverMoveEvent(e)
 
     def hoverLeaveEvent(self, e: QtWidgets.QGraphicsSceneHoverEvent) -> None:
         self.unsetCursor()
+        self._current_cursor = None
         self._set_hover_state(rect_hl=False, circ_hl=False, click_hl=False)
         super().hoverLeaveEvent(e)
 
+    def _set_cursor(self, c) -> None:
+        # 光标未变时跳过 setCursor，避免每次移动都向窗口系统下发光标
+        if self._current_cursor != c:
+            self._current_cursor = c
+            self.setCursor(c)
+
     def _set_hover_state(self, rect_hl: bool, circ_hl: bool, click_hl: bool=False):
         changed = False
         if self._hl_rect != rect_hl:
@@ -715,14 +1095,14 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
                 self._click_hcode = hcode
                 self._click_press_local = e.pos()
                 self._click_press_center, self._click_press_a, self._click_press_b, self._click_press_shape = self._current_click_local()
-                self.setCursor(QtCore.Qt.ClosedHandCursor)
+                self._set_cursor(_CUR_CLOSED)
                 e.accept(); return
             # 点击区域本体
             if self._hit_click_inside(e.pos()):
                 self._mode = self.Mode.CLICK_MOVE
                 self._click_press_local = e.pos()
                 self._click_press_center, self._click_press_a, self._click_press_b, self._click_press_shape = self._current_click_local()
-                self.setCursor(QtCore.Qt.ClosedHandCursor)
+                self._set_cursor(_CUR_CLOSED)
                 e.accept(); return
 
         # 圆命中优先
@@ -730,47 +1110,46 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
             if not self._show_circle:
                 return False
             self._mode = self.Mode.DRAG_CIRCLE
-            self.setCursor(QtCore.Qt.ClosedHandCursor)
+            self._set_cursor(_CUR_CLOSED)
             # 记录按下时圆心
             center, _ = self._current_circle_local()
             self._press_center = QtCore.QPointF(center)
             e.accept(); return
         
         if self._can_hit_rect():
-            # 角
-            corner = self._hit_corner(rect, e.pos())
+            # 角（离框较远时跳过角/边判定，直接走默认移动）
+            near = self._near_rect(e.pos())
+            corner = self._hit_corner(rect, e.pos()) if near else -1
             if corner >= 0:
                 self._mode = self.Mode.RESIZE_CORNER
                 self._drag_corner = corner
                 # 记录按下时 TL/BR（场景）
                 tl_scene = self.mapToScene(rect.topLeft())
                 br_scene = self.mapToScene(rect.bottomRight())
-                self._press_tl_scene = tl_scene
-                self._press_br_scene = br_scene
+                l, t, r, b = tl_scene.x(), tl_scene.y(), br_scene.x(), br_scene.y()
+                self._press_tl_scene = (l, t)
+                self._press_br_scene = (r, b)
                 # 对角锚点
-                opp = [QtCore.QPointF(br_scene.x(), br_scene.y()),
-                    QtCore.QPointF(tl_scene.x(), br_scene.y()),
-                    QtCore.QPointF(tl_scene.x(), tl_scene.y()),
-                    QtCore.QPointF(br_scene.x(), tl_scene.y())]
+                opp = ((r, b), (l, b), (l, t), (r, t))
                 self._anchor_scene = opp[corner]
                 self._is_resizing = True
                 e.accept(); return
 
             # 边
-            edge = self._hit_edge(rect, e.pos())
+            edge = self._hit_edge(rect, e.pos()) if near else ''
             if edge:
                 self._mode = self.Mode.RESIZE_EDGE
                 self._edge_code = edge
                 tl_scene = self.mapToScene(rect.topLeft())
                 br_scene = self.mapToScene(rect.bottomRight())
-                self._press_tl_scene = tl_scene
-                self._press_br_scene = br_scene
+                self._press_tl_scene = (tl_scene.x(), tl_scene.y())
+                self._press_br_scene = (br_scene.x(), br_scene.y())
                 self._is_resizing = True
                 e.accept(); return
 
             # 默认移动（交给内置拖动）
             self._mode = self.Mode.MOVE
-            self.setCursor(QtCore.Qt.ClosedHandCursor)
+            self._set_cursor(_CUR_CLOSED)
             super().mousePressEvent(e)
             e.accept(); return
 
@@ -781,37 +1160,32 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
             super().mouseMoveEvent(e)
             e.accept(); return
 
-        scene_rect = self.scene().sceneRect() if self.scene() else QtCore.QRectF(-1e6, -1e6, 2e6, 2e6)
-
         if self._mode == self.Mode.RESIZE_CORNER:
             cur = e.scenePos()
-            tl_scene = QtCore.QPointF(min(cur.x(), self._anchor_scene.x()),
-                                      min(cur.y(), self._anchor_scene.y()))
-            br_scene = QtCore.QPointF(max(cur.x(), self._anchor_scene.x()),
-                                      max(cur.y(), self._anchor_scene.y()))
-            tl_scene, br_scene = self._clamp_scene_rect(tl_scene, br_scene, scene_rect)
+            px, py = cur.x(), cur.y()
+            ax, ay = self._anchor_scene
+            tlx, tly, brx, bry = self._clamp_scene_rect(min(px, ax), min(py, ay),
+                                                        max(px, ax), max(py, ay),
+                                                        self._scene_bounds)
             # 应用到 model
-            x, y, w, h = tl_scene.x(), tl_scene.y(), br_scene.x()-tl_scene.x(), br_scene.y()-tl_scene.y()
-            self.model.set_rect(x, y, max(MIN_RECT_SIZE, w), max(MIN_RECT_SIZE, h), source=self)
+            self._queue_geom(self.model.set_rect, tlx, tly, max(MIN_RECT_SIZE, brx - tlx), max(MIN_RECT_SIZE, bry - tly))
             e.accept(); return
 
         if self._mode == self.Mode.RESIZE_EDGE:
             cur = e.scenePos()
-            tl0, br0 = self._press_tl_scene, self._press_br_scene
-            tl_scene = QtCore.QPointF(tl0)
-            br_scene = QtCore.QPointF(br0)
+            tlx, tly = self._press_tl_scene
+            brx, bry = self._press_br_scene
             if self._edge_code == 'L':
-                x = min(cur.x(), br0.x() - MIN_RECT_SIZE); tl_scene.setX(x)
+                tlx = min(cur.x(), brx - MIN_RECT_SIZE)
             elif self._edge_code == 'R':
-                x = max(cur.x(), tl0.x() + MIN_RECT_SIZE); br_scene.setX(x)
+                brx = max(cur.x(), tlx + MIN_RECT_SIZE)
             elif self._edge_code == 'T':
-                y = min(cur.y(), br0.y() - MIN_RECT_SIZE); tl_scene.setY(y)
+                tly = min(cur.y(), bry - MIN_RECT_SIZE)
             elif self._edge_code == 'B':
-                y = max(cur.y(), tl0.y() + MIN_RECT_SIZE); br_scene.setY(y)
+                bry = max(cur.y(), tly + MIN_RECT_SIZE)
 
-            tl_scene, br_scene = self._clamp_scene_rect(tl_scene, br_scene, scene_rect)
-            x, y, w, h = tl_scene.x(), tl_scene.y(), br_scene.x()-tl_scene.x(), br_scene.y()-tl_scene.y()
-            self.model.set_rect(x, y, max(MIN_RECT_SIZE, w), max(MIN_RECT_SIZE, h), source=self)
+            tlx, tly, brx, bry = self._clamp_scene_rect(tlx, tly, brx, bry, self._scene_bounds)
+            self._queue_geom(self.model.set_rect, tlx, tly, max(MIN_RECT_SIZE, brx - tlx), max(MIN_RECT_SIZE, bry - tly))
             e.accept(); return
 
         if self._mode == self.Mode.DRAG_CIRCLE:
@@ -823,16 +1197,17 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
             _, r = self._current_circle_local()
 
             # 场景夹紧（可选）
-            scene = self.scene()
-            scene_rect = scene.sceneRect() if scene else QtCore.QRectF(-1e6, -1e6, 2e6, 2e6)
-            cx_scene = max(scene_rect.left() + r,  min(cx_scene, scene_rect.right()  - r))
-            cy_scene = max(scene_rect.top()  + r,  min(cy_scene, scene_rect.bottom() - r))
+            sl, st, sr, sb = self._scene_bounds
+            cx_scene = max(sl + r, min(cx_scene, sr - r))
+            cy_scene = max(st + r, min(cy_scene, sb - r))
 
             # ★ 写回“绝对（场景）坐标”
-            self.model.set_circle(cx_scene, cy_scene, source=self)
+            self._queue_geom(self.model.set_circle, cx_scene, cy_scene)
             e.accept(); return
         
         if self._mode in (self.Mode.CLICK_MOVE, self.Mode.CLICK_EDGE, self.Mode.CLICK_CORNER):
+            if self._pending_click_dirty is None:
+                self._pending_click_dirty = self._click_paint_rect()
             rect = self._current_rect_local()
             w, h = rect.width(), rect.height()
             cur = self.mapFromScene(e.scenePos())
@@ -841,26 +1216,19 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
             cx, cy = c0.x(), c0.y()
             a, b = a0, b0
 
-            # 场景矩形（用于夹紧）
-            scene = self.scene()
-            scene_rect = scene.sceneRect() if scene else QtCore.QRectF(-1e6, -1e6, 2e6, 2e6)
+            # 场景边界（用于夹紧）
+            bounds = self._scene_bounds
 
             if self._mode == self.Mode.CLICK_MOVE:
                 dx = cur.x() - self._click_press_local.x()
                 dy = cur.y() - self._click_press_local.y()
-                cx_moved = cx + dx
-                cy_moved = cy + dy
 
                 # 只夹中心：保证整框在场景内；a0/b0 不变
-                a_fix = max(1.0, float(a0))
-                b_fix = max(1.0, float(b0))
-                cx_scene = self.model.x + cx_moved
-                cy_scene = self.model.y + cy_moved
-                cx_scene = min(max(scene_rect.left()  + a_fix, cx_scene), scene_rect.right()  - a_fix)
-                cy_scene = min(max(scene_rect.top()   + b_fix, cy_scene), scene_rect.bottom() - b_fix)
+                cx_loc, cy_loc = self._clamp_center_to_scene(cx + dx, cy + dy, a0, b0,
+                                                             scene_bounds=bounds)
 
                 # 写回绝对坐标
-                self.model.set_click_center(cx_scene, cy_scene, source=self)
+                self._queue_geom(self.model.set_click_center, self.model.x + cx_loc, self.model.y + cy_loc)
                 e.accept(); return
 
             if self._mode == self.Mode.CLICK_EDGE:
@@ -876,14 +1244,10 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
                     a_new, b_new = a0, b0  # 兜底
 
                 # 只夹半轴：以中心为锚，半轴不得越出场景
-                cx_scene = self.model.x + cx_loc
-                cy_scene = self.model.y + cy_loc
-                max_a = max(1.0, min(cx_scene - scene_rect.left(),  scene_rect.right()  - cx_scene))
-                max_b = max(1.0, min(cy_scene - scene_rect.top(),   scene_rect.bottom() - cy_scene))
-                a_new = max(1.0, min(float(a_new), max_a))
-                b_new = max(1.0, min(float(b_new), max_b))
-
-                self.model.set_click_axes(a_new, b_new, source=self)
+                a_new, b_new = self._clamp_axes_to_scene(cx_loc, cy_loc, a_new, b_new,
+                                                         scene_bounds=bounds)
+
+                self._queue_geom(self.model.set_click_axes, a_new, b_new)
                 e.accept(); return
             if self._mode == self.Mode.CLICK_CORNER:
                 cx_loc, cy_loc = cx, cy  # 局部中心保持不变
@@ -900,28 +1264,36 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
                     b_new = max(1.0, b0 * s)
 
                 # 只夹半轴：以中心为锚，半轴不得越出场景
-                cx_scene = self.model.x + cx_loc
-                cy_scene = self.model.y + cy_loc
-                max_a = max(1.0, min(cx_scene - scene_rect.left(),  scene_rect.right()  - cx_scene))
-                max_b = max(1.0, min(cy_scene - scene_rect.top(),   scene_rect.bottom() - cy_scene))
-                a_new = max(1.0, min(float(a_new), max_a))
-                b_new = max(1.0, min(float(b_new), max_b))
-
-                self.model.set_click_axes(a_new, b_new, source=self)
+                a_new, b_new = self._clamp_axes_to_scene(cx_loc, cy_loc, a_new, b_new,
+                                                         scene_bounds=bounds)
+
+                self._queue_geom(self.model.set_click_axes, a_new, b_new)
                 e.accept(); return
 
         e.ignore()
 
+    # -------------------- 拖动写回节流 --------------------
+    def _queue_geom(self, setter, *args) -> None:
+        """拖动中暂存最新几何（同一 setter 覆盖），下一轮事件循环统一写回 model。
+        这里不先 update()：paint 读的是 model 几何，写回前重画只会画出旧形状；
+        写回与其触发的重画在同一轮事件循环内完成，不多等一帧。"""
+        self._pending_geom[setter] = args
+        _notify_bus().enqueue(self.model.id, self._flush_pending_geom, quiet=False)
+
+    def _flush_pending_geom(self, _diff_id: Optional[str] = None) -> None:
+        if not self._pending_geom:
+            return
+        pending, self._pending_geom = self._pending_geom, {}
+        for setter, args in pending.items():
+            setter(*args, source=self)
+
     def mouseReleaseEvent(self, e: QtWidgets.QGraphicsSceneMouseEvent):
+        self._flush_pending_geom()   # 松手时落实最后一次拖动结果
         self._mode = self.Mode.NONE
         self._is_resizing = False
         self.updateEnabledFlags()
-        self.setCursor(QtCore.Qt.OpenHandCursor)
-        if callable(self._on_change):
-            try:
-                self._on_change(self.model.id)
-            except Exception:
-                pass
+        self._set_cursor(_CUR_OPEN)
+        _notify_bus().enqueue(self.model.id, self._on_change)
         super().mouseReleaseEvent(e)
 
     def contextMenuEvent(self, e: QtWidgets.QGraphicsSceneContextMenuEvent) -> None:
@@ -957,35 +1329,68 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
             if hasattr(self, "_refresh_bounds_if_needed"):
                 self._refresh_bounds_if_needed()
             self.update()
-            if (callable(self._on_change)):
-                try:
-                    self._on_change(self.model.id)
-                except Exception:
-                    pass
+            _notify_bus().enqueue(self.model.id, self._on_change)
             e.accept(); return
 
         e.accept()
 
     # -------------------- 外部选中态 --------------------
+    def setSelectedAlpha(self, alpha: int) -> None:
+        alpha = max(0, min(255, int(alpha)))
+        if self._selected_alpha == alpha:
+            return
+        self._selected_alpha = alpha
+        self._brush_cache.clear()
+        if self._extern_selected:
+            self.update()
+
     def setExternalSelected(self, selected: bool, *, raise_z: bool = True) -> None:
-        if self._extern_selected == bool(selected):
+        selected = bool(selected)
+        if self._extern_selected == selected:
             return
-        self._extern_selected = bool(selected)
+        self._extern_selected = selected
         if raise_z:
-            self.setZValue(2 if self._extern_selected else 1)
-        self.update()
+            z = 2 if selected else 1
+            if self._z != z:   # 与当前 z 相同则不走 C++ 调用
+                self.setZValue(z)
+                self._z = z
+        # 隐藏的图元无需重绘（离屏区域 Qt 本身会裁掉）
+        if self.isVisible():
+            self.update()
 
     # -------------------- itemChange：移动夹紧并写回 model --------------------
     def itemChange(self, change, value):
+        if change == QtWidgets.QGraphicsItem.ItemSceneHasChanged:
+            # 进入/离开场景：刷新边界缓存
+            scene = self.scene()
+            if scene is not None:
+                sr = scene.sceneRect()
+                self._scene_bounds = (sr.left(), sr.top(), sr.right(), sr.bottom())
+                self._recompute_circle_rect()
+                self._invalidate_geom_cache()
+                self._refresh_bounds_if_needed()
+            else:
+                self._scene_bounds = _NO_SCENE_BOUNDS
+            return super().itemChange(change, value)
+
+        if change == QtWidgets.QGraphicsItem.ItemVisibleHasChanged:
+            # 隐藏期间跳过了重绘，重新显示时让缓存作废
+            if self.isVisible():
+                self.update()
+            return super().itemChange(change, value)
+
         if change == QtWidgets.QGraphicsItem.ItemPositionChange and self.scene():
             if not self._rect_interactions_allowed():
                 return QtCore.QPointF(self.pos())
             # 夹到场景
             new_pos: QtCore.QPointF = value
-            rect = self._current_rect_local()
-            scene_rect = self.scene().sceneRect()
-            new_x = max(scene_rect.left(),  min(new_pos.x(), scene_rect.right()  - rect.width()))
-            new_y = max(scene_rect.top(),   min(new_pos.y(), scene_rect.bottom() - rect.height()))
+            sl, st, sr, sb = self._scene_bounds
+            sz = self._cached_rect_size
+            nx, ny = new_pos.x(), new_pos.y()
+            new_x = max(sl, min(nx, sr - sz.width()))
+            new_y = max(st, min(ny, sb - sz.height()))
+            if new_x == nx and new_y == ny:
+                return value   # 未越界：原样返回，免构造新点
             return QtCore.QPointF(new_x, new_y)
 
         if change == QtWidgets.QGraphicsItem.ItemPositionHasChanged:
@@ -1006,22 +1411,35 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
         if abs(new_w - old_sz.width()) > 1e-6 or abs(new_h - old_sz.height()) > 1e-6:
             self.prepareGeometryChange()
             self._cached_rect_size = QtCore.QSizeF(new_w, new_h)
+            self._rebuild_rect_caches()
         self.setPos(self.model.x, self.model.y)
+        self._recompute_circle_rect()
+        self._invalidate_geom_cache()
         self._refresh_bounds_if_needed()
-        self._text_cache_key = None
+        self._static_text_key = None
         self.update()
 
     @QtCore.Slot(object)
     def _on_model_circle_changed(self, source):
+        self._recompute_circle_rect()
+        self._invalidate_geom_cache()
         self._refresh_bounds_if_needed()   # ★ 新增
         self.update()
 
     @QtCore.Slot(object)
     def _on_model_any_changed(self, source):
-        self._text_cache_key = None
+        self._click_local_key = None   # 外部可能直接改过 dataclass 后再广播
+        self._static_text_key = None
         self._apply_enabled_flags()   # ★ 新增：同步拖动/拉伸开关
+        self._recompute_circle_rect()
+        self._invalidate_geom_cache()
         self._refresh_bounds_if_needed()
-        self.update()
+        # 自己拖动点击区域引起的变化：只刷新点击区域新旧范围
+        dirty, self._pending_click_dirty = self._pending_click_dirty, None
+        if source is self and dirty is not None:
+            self.update(dirty.united(self._click_paint_rect()))
+        else:
+            self.update()
 
     # -------------------- 命中工具 --------------------
 
@@ -1038,12 +1456,22 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
         """点击区域是否参与命中：需已自定义且可见。"""
         return self.model.click_customized and self._show_click and self.isVisible()
 
+    def _near_rect(self, pos: QtCore.QPointF) -> bool:
+        """是否落在按命中阈值外扩后的红框包围盒内（角/边判定的前置粗筛）。"""
+        t = self.RECT_REACH
+        sz = self._cached_rect_size
+        x, y = pos.x(), pos.y()
+        return -t <= x <= sz.width() + t and -t <= y <= sz.height() + t
+
     def _hit_corner(self, rect: QtCore.QRectF, pos: QtCore.QPointF) -> int:
         if not self._can_hit_rect():
             return -1
-        corners = [rect.topLeft(), rect.topRight(), rect.bottomRight(), rect.bottomLeft()]
-        for i, c in enumerate(corners):
-            if QtCore.QLineF(pos, c).length() <= self.CORNER_THRESH:
+        x, y = pos.x(), pos.y()
+        l, t, r, b = rect.left(), rect.top(), rect.right(), rect.bottom()
+        th2 = self.CORNER_THRESH_SQ
+        for i, (cx, cy) in enumerate(((l, t), (r, t), (r, b), (l, b))):
+            dx = x - cx; dy = y - cy
+            if dx*dx + dy*dy <= th2:
                 return i
         return -1
 
@@ -1068,8 +1496,9 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
         if not bbox:
             # 无 PNG 时退回旧的“半径判定”
             c, r = self._current_circle_local()
-            pad = self._scene_pick_radius(4.0)
-            return QtCore.QLineF(pos, c).length() <= (r + pad)
+            rr = r + self._scene_pick_radius(4.0)
+            dx = pos.x() - c.x(); dy = pos.y() - c.y()
+            return dx*dx + dy*dy <= rr*rr
 
         # 轻微外扩，提升命中手感
         pad = self._scene_pick_radius(3.0)
@@ -1080,16 +1509,29 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
         if not self._can_hit_click():
             return None
         c, a, b, shape = self._current_click_local()
-        handles = self._click_handles(c, a, b, shape)
         pick_edge   = self._scene_pick_radius(16.0)  # L/R/T/B 更宽松
         pick_corner = self._scene_pick_radius(12.0)
 
+        # 包围盒粗筛：手柄都在 (c±a, c±b) 外框上，离外框超过拾取半径则不可能命中
+        x, y = pos.x(), pos.y()
+        reach = max(pick_edge, pick_corner)
+        if abs(x - c.x()) > a + reach or abs(y - c.y()) > b + reach:
+            return None
+        handles = self._click_handles(c, a, b, shape)
+        edge2 = pick_edge * pick_edge
+        corner2 = pick_corner * pick_corner
         for code in ("L","R","T","B"):
-            if code in handles and QtCore.QLineF(pos, handles[code]).length() <= pick_edge:
-                return code
+            pt = handles.get(code)
+            if pt is not None:
+                dx = x - pt.x(); dy = y - pt.y()
+                if dx*dx + dy*dy <= edge2:
+                    return code
         for code in ("TL","TR","BR","BL"):
-            if code in handles and QtCore.QLineF(pos, handles[code]).length() <= pick_corner:
-                return code
+            pt = handles.get(code)
+            if pt is not None:
+                dx = x - pt.x(); dy = y - pt.y()
+                if dx*dx + dy*dy <= corner2:
+                    return code
         return None
     
     def _hit_click_inside(self, pos: QtCore.QPointF) -> bool:
@@ -1106,9 +1548,16 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
     def _circle_pixmap_bbox(self) -> Optional[QtCore.QRectF]:
         if not self._show_circle:
             return None
+        return self._circle_rect
+
+    def _recompute_circle_rect(self):
+        """圆（PNG）外接矩形缓存：矩形/圆心/等级/场景变化时重算。"""
+        self._circle_rect = self._compute_circle_rect()
+
+    def _compute_circle_rect(self) -> QtCore.QRectF:
         c, r = self._current_circle_local()
 
-        lvl = max(1, min(int(self.model.hint_level), len(RADIUS_LEVELS)))
+        lvl = self._level_from_model()
         pm  = CirclePixmapProvider.instance().get(lvl)
         if pm.isNull():
             # 没有 PNG 时退回数学圆（也能工作）
@@ -1121,29 +1570,34 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
         top_left = QtCore.QPointF(c.x() - w*0.5, c.y() - h*0.5)
         return QtCore.QRectF(top_left, QtCore.QSizeF(w, h))
 
-    def _clamp_scene_rect(self, tl: QtCore.QPointF, br: QtCore.QPointF,
-                          scene_rect: QtCore.QRectF) -> Tuple[QtCore.QPointF, QtCore.QPointF]:
+    @staticmethod
+    def _clamp_scene_rect(tlx: float, tly: float, brx: float, bry: float,
+                          scene_bounds: Tuple[float, float, float, float]
+                          ) -> Tuple[float, float, float, float]:
+        """纯标量夹紧：入参/出参均为场景坐标 (tlx, tly, brx, bry)。"""
+        sl, st, sr, sb = scene_bounds
         # 归一化
-        tl = QtCore.QPointF(min(tl.x(), br.x()), min(tl.y(), br.y()))
-        br = QtCore.QPointF(max(tl.x(), br.x()), max(tl.y(), br.y()))
+        if tlx > brx: tlx, brx = brx, tlx
+        if tly > bry: tly, bry = bry, tly
         # 夹到场景边界
-        tl.setX(max(scene_rect.left(),  tl.x()))
-        tl.setY(max(scene_rect.top(),   tl.y()))
-        br.setX(min(scene_rect.right(), br.x()))
-        br.setY(min(scene_rect.bottom(),br.y()))
+        tlx = max(sl, tlx); tly = max(st, tly)
+        brx = min(sr, brx); bry = min(sb, bry)
         # 最小尺寸
-        w = max(MIN_RECT_SIZE, br.x() - tl.x())
-        h = max(MIN_RECT_SIZE, br.y() - tl.y())
-        br = QtCore.QPointF(min(scene_rect.right(),  tl.x() + w),
-                            min(scene_rect.bottom(), tl.y() + h))
-        return tl, br
+        w = max(MIN_RECT_SIZE, brx - tlx)
+        h = max(MIN_RECT_SIZE, bry - tly)
+        return tlx, tly, min(sr, tlx + w), min(sb, tly + h)
     
-    def _clamp_center_to_scene(self, cx_local: float, cy_local: float, a: float, b: float):
-        """只夹紧中心点到 sceneRect，a/b 完全不动。入参/出参均为【局部坐标】。"""
-        scene = self.scene()
-        if not scene:
-            return cx_local, cy_local
-        scene_rect = scene.sceneRect()
+    def _clamp_center_to_scene(self, cx_local: float, cy_local: float, a: float, b: float,
+                               scene_bounds: Optional[Tuple[float, float, float, float]] = None):
+        """只夹紧中心点到 sceneRect，a/b 完全不动。入参/出参均为【局部坐标】。
+        scene_bounds=(l, t, r, b) 可由热路径预先传入，省去查询场景。"""
+        if scene_bounds is None:
+            scene = self.scene()
+            if not scene:
+                return cx_local, cy_local
+            rect = scene.sceneRect()
+            scene_bounds = (rect.left(), rect.top(), rect.right(), rect.bottom())
+        sl, st, sr, sb = scene_bounds
 
         # 当前中心的“场景坐标”
         cx_scene = self.model.x + float(cx_local)
@@ -1151,26 +1605,31 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
 
         # 仅用 a/b 计算可见边界，绝不改 a/b
         a = max(1.0, float(a)); b = max(1.0, float(b))
-        cx_scene = min(max(scene_rect.left()  + a, cx_scene), scene_rect.right()  - a)
-        cy_scene = min(max(scene_rect.top()   + b, cy_scene), scene_rect.bottom() - b)
+        cx_scene = min(max(sl + a, cx_scene), sr - a)
+        cy_scene = min(max(st + b, cy_scene), sb - b)
 
         # 回到局部
         return cx_scene - self.model.x, cy_scene - self.model.y
 
 
-    def _clamp_axes_to_scene(self, cx_local: float, cy_local: float, a: float, b: float):
-        """只夹紧半轴到 sceneRect，中心点不动。入参/出参均为【局部坐标】。"""
-        scene = self.scene()
-        if not scene:
-            return max(1.0, float(a)), max(1.0, float(b))
-        scene_rect = scene.sceneRect()
+    def _clamp_axes_to_scene(self, cx_local: float, cy_local: float, a: float, b: float,
+                             scene_bounds: Optional[Tuple[float, float, float, float]] = None):
+        """只夹紧半轴到 sceneRect，中心点不动。入参/出参均为【局部坐标】。
+        scene_bounds=(l, t, r, b) 可由热路径预先传入，省去查询场景。"""
+        if scene_bounds is None:
+            scene = self.scene()
+            if not scene:
+                return max(1.0, float(a)), max(1.0, float(b))
+            rect = scene.sceneRect()
+            scene_bounds = (rect.left(), rect.top(), rect.right(), rect.bottom())
+        sl, st, sr, sb = scene_bounds
 
         cx_scene = self.model.x + float(cx_local)
         cy_scene = self.model.y + float(cy_local)
 
         # 以“中心点”为锚，半轴不能越出场景
-        max_a = max(1.0, min(cx_scene - scene_rect.left(),  scene_rect.right()  - cx_scene))
-        max_b = max(1.0, min(cy_scene - scene_rect.top(),   scene_rect.bottom() - cy_scene))
+        max_a = max(1.0, min(cx_scene - sl, sr - cx_scene))
+        max_b = max(1.0, min(cy_scene - st, sb - cy_scene))
 
         a = max(1.0, min(float(a), max_a))
         b = max(1.0, min(float(b), max_b))
@@ -1207,7 +1666,7 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
 
     def updateLabel(self):
         # 现用现取 model.label，仅需清缓存
-        self._text_cache_key = None
+        self._static_text_key = None
         self.update()
 
     def updateEnabledFlags(self):
@@ -1227,5 +1686,7 @@ class DifferenceItem(QtWidgets.QGraphicsObject):
             if not self._show_rect:   self._hl_rect = False
             if not self._show_circle: self._hl_circle = False
             if not self._show_click:  self._hl_click = False
+            self._click_local_key = None   # 外部可能直接改过 dataclass
+            self._invalidate_geom_cache()
             self._refresh_bounds_if_needed()
             self.update()
@@ -1,16 +1,27 @@
+import functools
+import itertools
+import math
 import os
+import re
+import stat
 import sys
 from dataclasses import dataclass
 from typing import List, Optional
 
 from PySide6 import QtCore, QtGui, QtWidgets
-from editor import DifferenceEditorWindow
 from circle_provider import CirclePixmapProvider
+from thumb_loader import ThumbnailLoader
 
 IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.bmp', '.gif'}
+# 一次匹配同时完成扩展名过滤与 name_A / name_B 拆分
+_PAIR_RE = re.compile(
+    r'^(?P<base>.+)_(?P<side>[AB])(?P<ext>\.(?:%s))$'
+    % '|'.join(sorted(re.escape(e[1:]) for e in IMAGE_EXTENSIONS)),
+    re.IGNORECASE,
+)
 
 
-@dataclass
+@dataclass(slots=True)
 class ImagePair:
     name: str
     directory: str
@@ -18,18 +29,44 @@ class ImagePair:
     image_path_b: str
     ext_a: str
     ext_b: str
+    mtime_a: Optional[float] = None   # 扫描目录时顺带取得，作缩略图缓存键
+
+# 主窗口/卡片样式：应用级一次性设置，各控件只设 objectName
+APP_QSS = """
+QFrame#ImageCard, QFrame#ImageCard QFrame { background: white; border-radius: 8px; border: 1px solid #eee; }
+QFrame#ImageCard QLabel#CardImage { border-top-left-radius: 8px; border-top-right-radius: 8px; }
+QFrame#ImageCard QLabel#CardTitle { padding: 0 12px; font-weight: 600; color: #333; border-top: 1px solid #eee; }
+QLabel#GridEmpty { color:#666; padding: 60px 20px; }
+
+QWidget#Header { background:white; border-radius:8px; }
+QLabel#AppTitle { background:white; border-radius:8px; font-size:20px; font-weight:700; color:#333; }
+QPushButton#PrimaryBtn {
+    background:#0d6efd; color:#fff; padding:6px 12px;
+    border-radius:6px; border:1px solid #0d6efd;
+}
+QPushButton#PrimaryBtn:hover { background:#0b5ed7; border-color:#0b5ed7; }
+
+QLabel#ConfigDirLabel { background:#f8f9fa; padding:6px 10px; border:1px solid #eee; border-radius:4px; font-size:12px; color:#333; }
+QLabel#StatusLabel { background:#e9ecef; padding:8px 10px; border-radius:4px; font-size:13px; }
+"""
 
 
 class ImageCard(QtWidgets.QFrame):
-    clicked = QtCore.Signal(object)
+    _placeholder: Optional[QtGui.QPixmap] = None   # 所有卡片共享的占位图
+
+    @classmethod
+    def _get_placeholder(cls) -> QtGui.QPixmap:
+        if cls._placeholder is None:
+            pm = QtGui.QPixmap(240, 150)
+            pm.fill(QtGui.QColor("#f0f0f0"))
+            cls._placeholder = pm
+        return cls._placeholder
 
     def __init__(self, pair: ImagePair, parent: Optional[QtWidgets.QWidget] = None) -> None:
         super().__init__(parent)
         self.pair = pair
         self.setFrameShape(QtWidgets.QFrame.StyledPanel)
-        self.setStyleSheet(
-            "QFrame { background: white; border-radius: 8px; border: 1px solid #eee; }"
-        )
+        self.setObjectName("ImageCard")   # 样式见 APP_QSS
         # fixed, compact card size to fit 4 columns (image 240x150 + title 40)
         self.setFixedSize(240, 190)
         self.setSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
@@ -44,28 +81,142 @@ class ImageCard(QtWidgets.QFrame):
         image_label = QtWidgets.QLabel(self)
         image_label.setFixedSize(240, 150)
         image_label.setAlignment(QtCore.Qt.AlignCenter)
-        image_label.setStyleSheet("border-top-left-radius: 8px; border-top-right-radius: 8px;")
-        pixmap = QtGui.QPixmap(self.pair.image_path_a)
-        if not pixmap.isNull():
-            image_label.setPixmap(pixmap.scaled(image_label.size(), QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation))
+        image_label.setObjectName("CardImage")
+        self._image_label = image_label
         layout.addWidget(image_label)
 
         # Title
-        title = QtWidgets.QLabel(self.pair.name, self)
+        title = QtWidgets.QLabel(self)
         title.setAlignment(QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter)
         title.setFixedHeight(40)
-        title.setStyleSheet(
-            "padding: 0 12px; font-weight: 600; color: #333; border-top: 1px solid #eee;"
-        )
+        title.setObjectName("CardTitle")
         layout.addWidget(title)
+        self._title = title
+
+        self.set_pair(pair)
+
+    def set_pair(self, pair: ImagePair) -> None:
+        """复用卡片：换绑到另一组图片（虚拟化网格滚动时调用）。"""
+        self.pair = pair
+        self._title.setText(pair.name)
+        self._image_label.setPixmap(ImageCard._get_placeholder())   # 缩略图到达前先显示占位
+        # 缩略图走缓存（内存/磁盘），未命中时后台按 240x150 直接解码，不阻塞列表加载
+        ThumbnailLoader.instance().request(pair.image_path_a, 240, 150, self, self._on_thumb,
+                                           mtime=pair.mtime_a)
+
+    def _on_thumb(self, path: str, pixmap: QtGui.QPixmap) -> None:
+        if path == self.pair.image_path_a:
+            self._image_label.setPixmap(pixmap)
+
+
+class _CardPoolLayout(QtWidgets.QLayout):
+    """
+    虚拟化网格布局：只为与视口相交的行摆放卡片，卡片对象池复用（滚动时换绑 pair），
+    布局代价为 O(可见卡片数) 而非 O(总数)。
+    """
 
-    def mouseReleaseEvent(self, event: QtGui.QMouseEvent) -> None:
-        if event.button() == QtCore.Qt.LeftButton:
-            self.clicked.emit(self.pair)
-        super().mouseReleaseEvent(event)
+    def __init__(self, parent: QtWidgets.QWidget, card_factory,
+                 cols: int, card_w: int, card_h: int, v_gap: int) -> None:
+        super().__init__(parent)
+        self._make_card = card_factory
+        self.cols, self.card_w, self.card_h, self.v_gap = cols, card_w, card_h, v_gap
+        self.h_gap = 16
+        self._pairs: List[ImagePair] = []
+        self._pool: List[ImageCard] = []
+        self._items: List[QtWidgets.QLayoutItem] = []
+        self._empty: Optional[QtWidgets.QWidget] = None
+        self._view_top = 0
+        self._view_h = 0
+
+    # ---- QLayout 接口（只管理池内卡片与空状态标签）----
+    def addItem(self, item: QtWidgets.QLayoutItem) -> None:
+        self._items.append(item)
+
+    def count(self) -> int:
+        return len(self._items)
+
+    def itemAt(self, index: int):
+        return self._items[index] if 0 <= index < len(self._items) else None
+
+    def takeAt(self, index: int):
+        return self._items.pop(index) if 0 <= index < len(self._items) else None
+
+    def _rows(self) -> int:
+        return math.ceil(len(self._pairs) / self.cols)
+
+    def sizeHint(self) -> QtCore.QSize:
+        return self.minimumSize()
+
+    def minimumSize(self) -> QtCore.QSize:
+        w = self.cols * self.card_w + (self.cols + 1) * self.h_gap
+        if not self._pairs:
+            h = self._empty.sizeHint().height() if self._empty is not None else 0
+            return QtCore.QSize(w, h)
+        rows = self._rows()
+        return QtCore.QSize(w, rows * (self.card_h + self.v_gap) - self.v_gap)
+
+    def setGeometry(self, rect: QtCore.QRect) -> None:
+        super().setGeometry(rect)
+        self._place()
+
+    # ---- 数据/视口 ----
+    def set_pairs(self, pairs: List[ImagePair], empty: Optional[QtWidgets.QWidget]) -> None:
+        self._pairs = pairs
+        self._empty = empty
+        self.invalidate()
+        self._place()
+
+    def set_h_gap(self, gap: int) -> None:
+        if gap == self.h_gap:
+            return                      # 间距未变：不作废布局
+        self.h_gap = gap
+        self.invalidate()
+
+    def set_viewport(self, top: int, height: int) -> None:
+        self._view_top, self._view_h = top, height
+        self._place()
+
+    def _place(self) -> None:
+        rect = self.geometry()
+        if self._empty is not None:
+            self._empty.setVisible(not self._pairs)
+            if not self._pairs:
+                self._empty.setGeometry(rect)
+
+        # 可见行 [first, last)，上下各多留一行缓冲
+        row_h = self.card_h + self.v_gap
+        first = max(0, self._view_top // row_h - 1)
+        last = min(self._rows(), (self._view_top + self._view_h) // row_h + 2)
+        start = first * self.cols
+        end = min(len(self._pairs), last * self.cols)
+        need = max(0, end - start)
+
+        while len(self._pool) < need:
+            card = self._make_card(self._pairs[start + len(self._pool)])
+            self._pool.append(card)
+            self.addChildWidget(card)
+            self._items.append(QtWidgets.QWidgetItem(card))
+
+        x0 = rect.x() + self.h_gap
+        for i, card in enumerate(self._pool):
+            if i >= need:
+                if card.isVisible():
+                    card.hide()
+                continue
+            idx = start + i
+            pair = self._pairs[idx]
+            if card.pair is not pair:
+                card.set_pair(pair)
+            row, col = divmod(idx, self.cols)
+            card.setGeometry(x0 + col * (self.card_w + self.h_gap),
+                             rect.y() + row * row_h, self.card_w, self.card_h)
+            if not card.isVisible():
+                card.show()
 
 
 class FlowGrid(QtWidgets.QScrollArea):
+    cardClicked = QtCore.Signal(object)
+
     def __init__(self, parent: Optional[QtWidgets.QWidget] = None) -> None:
         super().__init__(parent)
         self.setWidgetResizable(True)
@@ -73,58 +224,81 @@ class FlowGrid(QtWidgets.QScrollArea):
         self.cols = 4
         self.card_width = 240
         self.container = QtWidgets.QWidget()
-        self.vbox = QtWidgets.QVBoxLayout(self.container)
-        self.vbox.setContentsMargins(0, 0, 0, 0)
-        self.vbox.setSpacing(16)
-        self.setWidget(self.container)
-
-        self.grid = QtWidgets.QGridLayout()
+        self.grid = _CardPoolLayout(self.container, self._make_card,
+                                    cols=self.cols, card_w=self.card_width, card_h=190, v_gap=16)
         self.grid.setContentsMargins(0, 0, 0, 0)
-        self.grid.setHorizontalSpacing(16)
-        self.grid.setVerticalSpacing(16)
-        self.grid.setAlignment(QtCore.Qt.AlignTop)
-        self.vbox.addLayout(self.grid)
-
-    def set_cards(self, cards: List[ImageCard]) -> None:
-        while self.grid.count():
-            item = self.grid.takeAt(0)
-            w = item.widget()
-            if w is not None:
-                w.setParent(None)
-
-        if not cards:
-            empty = QtWidgets.QLabel("暂无图片\n请点击\"加载图片\"按钮选择包含图片资源的文件夹（文件名需匹配 *_A 与 *_B）")
-            empty.setAlignment(QtCore.Qt.AlignCenter)
-            empty.setStyleSheet("color:#666; padding: 60px 20px;")
-            self.grid.addWidget(empty, 0, 0)
-            return
+        self.setWidget(self.container)
 
-        cols = self.cols
-        row = col = 0
-        for card in cards:
-            self.grid.addWidget(card, row, col)
-            col += 1
-            if col >= cols:
-                col = 0
-                row += 1
-        self.apply_flow_metrics()
+        self._empty = QtWidgets.QLabel("暂无图片\n请点击\"加载图片\"按钮选择包含图片资源的文件夹（文件名需匹配 *_A 与 *_B）",
+                                       self.container)
+        self._empty.setAlignment(QtCore.Qt.AlignCenter)
+        self._empty.setObjectName("GridEmpty")
+        self._empty.hide()
+
+        self.verticalScrollBar().valueChanged.connect(self._sync_viewport)
+
+        self._last_vw = -1   # 上次计算间距时的视口宽度
+        # 拖动缩放窗口时合并重排：每帧（16ms）最多一次
+        self._relayout_timer = QtCore.QTimer(self)
+        self._relayout_timer.setSingleShot(True)
+        self._relayout_timer.setInterval(16)
+        self._relayout_timer.timeout.connect(self._do_apply_flow_metrics)
+
+    def _make_card(self, pair: ImagePair) -> ImageCard:
+        card = ImageCard(pair, self.container)
+        card.installEventFilter(self)   # 点击统一由网格分发，不逐卡连接信号
+        return card
+
+    def eventFilter(self, obj: QtCore.QObject, event: QtCore.QEvent) -> bool:
+        if (event.type() == QtCore.QEvent.MouseButtonRelease
+                and event.button() == QtCore.Qt.LeftButton
+                and isinstance(obj, ImageCard)):
+            self.cardClicked.emit(obj.pair)
+        return super().eventFilter(obj, event)
+
+    def set_pairs(self, pairs: List[ImagePair]) -> None:
+        # 换绑/摆放期间暂停重绘与信号：整批只触发一次布局与一次重绘
+        self.setUpdatesEnabled(False)
+        self.container.setUpdatesEnabled(False)
+        self.container.blockSignals(True)
+        try:
+            self.grid.set_pairs(pairs, self._empty)
+            self.verticalScrollBar().setValue(0)
+            self._sync_viewport()
+            self._do_apply_flow_metrics()
+        finally:
+            self.container.blockSignals(False)
+            self.container.setUpdatesEnabled(True)
+            self.setUpdatesEnabled(True)
+            self.container.updateGeometry()
+
+    def _sync_viewport(self, *_) -> None:
+        self.grid.set_viewport(self.verticalScrollBar().value(), self.viewport().height())
 
     def resizeEvent(self, event: QtGui.QResizeEvent) -> None:
         super().resizeEvent(event)
+        self._sync_viewport()
         self.apply_flow_metrics()
 
     def apply_flow_metrics(self) -> None:
+        self._relayout_timer.start()
+
+    def _do_apply_flow_metrics(self) -> None:
         # Distribute remaining width evenly as left/right margins and gaps (space-between)
         vw = self.viewport().width()
+        if vw == self._last_vw:
+            return
+        self._last_vw = vw
         min_gap = 12
         total_cards = self.cols * self.card_width
         remaining = max(0, vw - total_cards)
         gap = max(min_gap, remaining // (self.cols + 1))
-        self.grid.setHorizontalSpacing(gap)
-        self.grid.setContentsMargins(gap, 0, gap, 0)
+        self.grid.set_h_gap(gap)
 
 
 class MainWindow(QtWidgets.QMainWindow):
+    _SCAN_CHUNK = 512   # 每轮事件循环处理的目录项数
+
     def __init__(self) -> None:
         super().__init__()
         self.setWindowTitle("找不同游戏关卡编辑器")
@@ -133,6 +307,11 @@ class MainWindow(QtWidgets.QMainWindow):
         self.settings = QtCore.QSettings("FindDifferenceEditor", "PySideApp")
         self.config_dir: str = self.settings.value("configDir", "", type=str)
         self.image_dir: str = self.settings.value("imageDir", "", type=str)
+        self._editor_cls = None   # 延迟导入的 DifferenceEditorWindow
+        self._open_editors: set = set()   # 强引用已打开的编辑器，销毁时自动移除
+        # 分批加载状态：(代号, scandir 迭代器, 目录, 是否启动加载, 已配对结果)
+        self._load_job = None
+        self._load_gen = 0
 
         root = QtWidgets.QWidget()
         self.setCentralWidget(root)
@@ -145,7 +324,7 @@ class MainWindow(QtWidgets.QMainWindow):
         header_layout = QtWidgets.QHBoxLayout(header)
         header_layout.setContentsMargins(12, 12, 12, 12)
         header_layout.setSpacing(10)
-        header.setStyleSheet("background:white; border-radius:8px;")
+        header.setObjectName("Header")
 
         self.header = header  # 保存引用，后面算宽度要用
         self.header_layout = header_layout
@@ -155,7 +334,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.title_label.setWordWrap(False)
         self.title_label.setSizePolicy(QtWidgets.QSizePolicy.Ignored, QtWidgets.QSizePolicy.Fixed)
         self.title_label.setMinimumWidth(220)                 # ✅ 给一个最小宽度，避免被压没
-        self.title_label.setStyleSheet("font-size:20px; font-weight:700; color:#333;")
+        self.title_label.setObjectName("AppTitle")
 
         header_layout.addWidget(self.title_label)
         header_layout.addStretch(1)
@@ -163,15 +342,8 @@ class MainWindow(QtWidgets.QMainWindow):
         self.btn_set_config = QtWidgets.QPushButton("设置输出目录")
         self.btn_load_images = QtWidgets.QPushButton("加载图片")
 
-        btn_css = """
-        QPushButton{
-        background:#0d6efd; color:#fff; padding:6px 12px;
-        border-radius:6px; border:1px solid #0d6efd;
-        }
-        QPushButton:hover{ background:#0b5ed7; border-color:#0b5ed7; }
-        """
-        self.btn_set_config.setStyleSheet(btn_css)
-        self.btn_load_images.setStyleSheet(btn_css)
+        self.btn_set_config.setObjectName("PrimaryBtn")
+        self.btn_load_images.setObjectName("PrimaryBtn")
 
         header_layout.addWidget(self.btn_set_config)
         header_layout.addWidget(self.btn_load_images)
@@ -180,17 +352,24 @@ class MainWindow(QtWidgets.QMainWindow):
 
         # Config directory persistent display
         self.config_dir_label = QtWidgets.QLabel()
-        self.config_dir_label.setStyleSheet("background:#f8f9fa; padding:6px 10px; border:1px solid #eee; border-radius:4px; font-size:12px; color:#333;")
+        self.config_dir_label.setObjectName("ConfigDirLabel")
         self.config_dir_label.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
+        # 缩放时省略文本的重算合并到每帧一次；(目录, 可用宽度) 未变则直接复用
+        self._elide_cache = (None, 0, "")
+        self._elide_timer = QtCore.QTimer(self)
+        self._elide_timer.setSingleShot(True)
+        self._elide_timer.setInterval(16)
+        self._elide_timer.timeout.connect(self.refresh_config_dir_label)
         vbox.addWidget(self.config_dir_label, 0)
 
         # Status bar like label
         self.status_label = QtWidgets.QLabel()
-        self.status_label.setStyleSheet("background:#e9ecef; padding:8px 10px; border-radius:4px; font-size:13px;")
+        self.status_label.setObjectName("StatusLabel")
         vbox.addWidget(self.status_label, 0)
 
         # Image grid
         self.grid = FlowGrid()
+        self.grid.cardClicked.connect(self.open_editor)
         vbox.addWidget(self.grid, 1)
 
         # Connections
@@ -222,19 +401,22 @@ class MainWindow(QtWidgets.QMainWindow):
             self.refresh_config_dir_label()
 
     def _validate_image_path(self, pair: ImagePair) -> (bool, str):
-        """检查 A/B 文件存在、可读、且 Qt 能加载。"""
+        """检查 A/B 文件存在、可读、且 Qt 能识别其格式（只读文件头）。"""
         for label, path in (("A", pair.image_path_a), ("B", pair.image_path_b)):
             if not path:
                 return False, f"未提供{label}图片路径。"
-            if not os.path.exists(path):
+            # 一次 stat 同时判断存在与文件类型
+            try:
+                st = os.stat(path)
+            except OSError:
                 return False, f"{label}图片文件不存在：\n{path}"
-            if not os.path.isfile(path):
+            if not stat.S_ISREG(st.st_mode):
                 return False, f"{label}不是一个有效文件：\n{path}"
             if not os.access(path, os.R_OK):
                 return False, f"{label}没有读取权限：\n{path}"
-            pix = QtGui.QPixmap(path)
-            if pix.isNull():
-                reader = QtGui.QImageReader(path)
+            # 只读文件头判断能否解码，不做整图解码
+            reader = QtGui.QImageReader(path)
+            if not reader.canRead() or not reader.size().isValid():
                 fmt = reader.format().data().decode("ascii", "ignore") if reader.format() else "unknown"
                 err = reader.errorString() if hasattr(reader, "errorString") else "unknown"
                 return False, f"无法加载{label}图片（格式:{fmt}）：\n{path}\n错误：{err}"
@@ -247,78 +429,120 @@ class MainWindow(QtWidgets.QMainWindow):
         self.load_images(directory)
 
     def load_images(self, directory: str, from_startup: bool = False) -> None:
+        """
+        分批扫描目录：每轮事件循环只处理 _SCAN_CHUNK 个目录项，大目录下窗口仍可绘制/响应；
+        扫描完成后一次性交给网格。再次调用会放弃尚未完成的扫描。
+        """
+        self._cancel_load()
         try:
-            files = sorted(os.listdir(directory))
+            it = os.scandir(directory)
         except Exception as exc:
-            if from_startup:
-                # 启动时自动加载失败，仅提示状态栏，不打扰用户
-                self.set_status(f"加载图片失败: {exc}")
-                return
-            QtWidgets.QMessageBox.critical(self, "加载图片失败", str(exc))
+            self._report_load_error(exc, from_startup)
             return
+        self._load_gen += 1
+        self._load_job = (self._load_gen, it, directory, from_startup, {})
+        self.set_status(f"正在扫描图片目录: {directory}")
+        self._schedule_load_chunk()
 
-        image_files = [f for f in files if os.path.splitext(f)[1].lower() in IMAGE_EXTENSIONS]
+    def _schedule_load_chunk(self) -> None:
+        gen = self._load_gen
+        QtCore.QTimer.singleShot(0, lambda: self._load_chunk(gen))
 
-        paired: dict = {}
-        for file in image_files:
-            stem, ext = os.path.splitext(file)
-            if "_" not in stem:
-                continue
-            base, suffix = stem.rsplit("_", 1)
-            if suffix.lower() not in ("a", "b") or not base:
-                continue
-            entry = paired.setdefault(base, {"A": None, "B": None, "ext_a": None, "ext_b": None})
-            full_path = os.path.join(directory, file)
-            if suffix.lower() == "a":
-                entry["A"] = full_path
-                entry["ext_a"] = ext
-            else:
-                entry["B"] = full_path
-                entry["ext_b"] = ext
-
-        pairs: List[ImagePair] = []
-        for base, info in paired.items():
-            if info["A"] and info["B"]:
-                pairs.append(
-                    ImagePair(
-                        name=base,
-                        directory=directory,
-                        image_path_a=info["A"],
-                        image_path_b=info["B"],
-                        ext_a=info["ext_a"] or os.path.splitext(info["A"])[1],
-                        ext_b=info["ext_b"] or os.path.splitext(info["B"])[1],
-                    )
-                )
-
-        cards: List[ImageCard] = []
-        for pair in pairs:
-            card = ImageCard(pair)
-            card.clicked.connect(self.open_editor)
-            cards.append(card)
-
-        self.grid.set_cards(cards)
+    def _cancel_load(self) -> None:
+        if self._load_job is not None:
+            self._load_job[1].close()
+            self._load_job = None
+
+    def _report_load_error(self, exc: Exception, from_startup: bool) -> None:
+        if from_startup:
+            # 启动时自动加载失败，仅提示状态栏，不打扰用户
+            self.set_status(f"加载图片失败: {exc}")
+            return
+        QtWidgets.QMessageBox.critical(self, "加载图片失败", str(exc))
+
+    def _load_chunk(self, gen: int) -> None:
+        job = self._load_job
+        if job is None or job[0] != gen:
+            return                                  # 已被新的加载取代
+        _, it, directory, from_startup, found = job
+        # scandir 目录项自带文件类型（免逐个 stat），先正则匹配再判类型
+        match = _PAIR_RE.match
+        n = 0
+        try:
+            for de in itertools.islice(it, self._SCAN_CHUNK):
+                n += 1
+                m = match(de.name)
+                if m is None or not de.is_file():
+                    continue
+                base = m['base']
+                entry = found.get(base)
+                if entry is None:
+                    entry = found[base] = [None, None, None, None, None]   # path_a, path_b, ext_a, ext_b, mtime_a
+                # 同一 base 同侧有多个文件（如 foo_A.png / foo_A.jpg）时，沿用按名排序后取最后一个的规则，
+                # 不随 scandir 的目录项顺序变化
+                if m['side'] in "Aa":
+                    if entry[0] is not None and entry[0] > de.path:
+                        continue
+                    entry[0] = de.path
+                    entry[2] = m['ext']
+                    try:
+                        entry[4] = de.stat().st_mtime
+                    except OSError:
+                        entry[4] = None
+                else:
+                    if entry[1] is not None and entry[1] > de.path:
+                        continue
+                    entry[1] = de.path
+                    entry[3] = m['ext']
+        except Exception as exc:
+            self._cancel_load()
+            self._report_load_error(exc, from_startup)
+            return
+
+        if n == self._SCAN_CHUNK:
+            self._schedule_load_chunk()             # 还有剩余，让出事件循环
+            return
+        self._cancel_load()
+        self._finish_load(directory, from_startup, found)
+
+    def _finish_load(self, directory: str, from_startup: bool, found: dict) -> None:
+        # 只对成组的 base 排序，不再排序全部文件名
+        pairs: List[ImagePair] = [
+            ImagePair(name=base, directory=directory,
+                      image_path_a=path_a, image_path_b=path_b,
+                      ext_a=ext_a, ext_b=ext_b, mtime_a=mtime_a)
+            for base, (path_a, path_b, ext_a, ext_b, mtime_a) in sorted(found.items())
+            if path_a and path_b
+        ]
+
+        # 卡片由网格按可见行按需创建/复用
+        self.grid.set_pairs(pairs)
         self.image_dir = directory
         self.settings.setValue("imageDir", self.image_dir)
         if from_startup:
-            self.set_status(f"成功加载 {len(cards)} 组图片（来自上次使用的图片目录）")
+            self.set_status(f"成功加载 {len(pairs)} 组图片（来自上次使用的图片目录）")
         else:
-            if not cards:
+            if not pairs:
                 self.set_status("未找到成对的图片，请确保文件名形如 name_A.jpg 和 name_B.jpg")
             else:
-                self.set_status(f"成功加载 {len(cards)} 组图片")
+                self.set_status(f"成功加载 {len(pairs)} 组图片")
 
     def refresh_config_dir_label(self) -> None:
+        w = self.config_dir_label.width() - 20
+        if (self.config_dir, w) == self._elide_cache[:2]:
+            return
         path = self.config_dir if self.config_dir else "未设置"
         text = f"输出目录: {path}"
         # elide middle if too long
         metrics = self.config_dir_label.fontMetrics()
-        elided = metrics.elidedText(text, QtCore.Qt.ElideMiddle, self.config_dir_label.width() - 20)
+        elided = metrics.elidedText(text, QtCore.Qt.ElideMiddle, w)
+        self._elide_cache = (self.config_dir, w, elided)
         self.config_dir_label.setText(elided)
 
     def resizeEvent(self, event: QtGui.QResizeEvent) -> None:
         super().resizeEvent(event)
         # keep elided label updated
-        self.refresh_config_dir_label()
+        self._elide_timer.start()
 
     def open_editor(self, pair: ImagePair) -> None:
         if not self.config_dir:
@@ -332,16 +556,18 @@ class MainWindow(QtWidgets.QMainWindow):
             self.set_status(f"打开失败：{reason.replace(os.linesep, ' ')}")
             return
 
-        win = DifferenceEditorWindow(pair=pair, config_dir=self.config_dir, parent=None)
-        # keep a reference to avoid immediate GC when parented
-        if not hasattr(self, "_open_editors"):
-            self._open_editors = []
-        self._open_editors.append(win)
-        win.destroyed.connect(lambda *_: self._open_editors.remove(win) if win in self._open_editors else None)
+        # 编辑器模块（graphics/models 等）较重：首次打开时才导入，加快主窗口首屏
+        if self._editor_cls is None:
+            from editor import DifferenceEditorWindow
+            self._editor_cls = DifferenceEditorWindow
+        win = self._editor_cls(pair=pair, config_dir=self.config_dir, parent=None)
+        # keep a reference to avoid immediate GC when parented（集合：O(1) 登记/移除）
+        self._open_editors.add(win)
+        win.destroyed.connect(functools.partial(self._open_editors.discard, win))
         win.show()
 
     def closeEvent(self, event: QtGui.QCloseEvent) -> None:
-        dirty_editors = [w for w in getattr(self, "_open_editors", []) if getattr(w, "_is_dirty", False)]
+        dirty_editors = [w for w in self._open_editors if getattr(w, "_is_dirty", False)]
         if dirty_editors:
             ret = QtWidgets.QMessageBox.question(
                 self,
@@ -354,17 +580,20 @@ class MainWindow(QtWidgets.QMainWindow):
                 event.ignore()
                 return
 
-        for win in list(getattr(self, "_open_editors", [])):
+        for win in list(self._open_editors):
             try:
                 win.close()
             except Exception:
                 pass
+        self._cancel_load()
         event.accept()
 
 def main() -> int:
     app = QtWidgets.QApplication(sys.argv)
     app.setOrganizationName("FindDifferenceEditor")
     app.setApplicationName("PySideApp")
+    QtGui.QPixmapCache.setCacheLimit(128 * 1024)  # KB；缩略图内存层上限（约 128MB），超出按 LRU 淘汰
+    app.setStyleSheet(APP_QSS)   # 全局只解析一次，按 objectName 命中
     w = MainWindow()
     CirclePixmapProvider.instance().preload_base()
     w.show()
@@ -1,9 +1,9 @@
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import Dict, Tuple
 from PySide6 import QtGui
 
 # Discrete hint-circle radius levels (in natural pixels)
-RADIUS_LEVELS: List[int] = [53, 59, 65, 71, 76, 81, 85, 90, 95, 100, 105,110, 117, 124,129]
+RADIUS_LEVELS: Tuple[int, ...] = (53, 59, 65, 71, 76, 81, 85, 90, 95, 100, 105,110, 117, 124,129)
 # Min rectangle size (natural pixels)
 MIN_RECT_SIZE: float = 110
 
@@ -17,7 +17,7 @@ CATEGORY_COLOR_MAP: Dict[str, QtGui.QColor] = {
     '修改': QtGui.QColor('#ff9800'),
 }
 
-@dataclass
+@dataclass(slots=True)
 class Difference:
     id: str
     name: str
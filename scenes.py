@@ -4,13 +4,19 @@ class ImageScene(QtWidgets.QGraphicsScene):
     def __init__(self, pixmap: QtGui.QPixmap):
         super().__init__(0, 0, pixmap.width(), pixmap.height())
         self.bg = QtWidgets.QGraphicsPixmapItem(pixmap)
+        # 背景不参与交互：按外接矩形命中，避免按像素掩码生成 shape；也不接收鼠标
+        self.bg.setShapeMode(QtWidgets.QGraphicsPixmapItem.BoundingRectShape)
+        self.bg.setAcceptedMouseButtons(QtCore.Qt.NoButton)
         self.addItem(self.bg)
 
 
 class ImageView(QtWidgets.QGraphicsView):
     def __init__(self, scene: ImageScene):
         super().__init__(scene)
-        self.setRenderHints(QtGui.QPainter.Antialiasing | QtGui.QPainter.SmoothPixmapTransform)
+        # 默认不开任何渲染提示：底图 QGraphicsPixmapItem 自带变换模式，标注图元按需局部开启抗锯齿
+        self.setRenderHints(QtGui.QPainter.RenderHint(0))
+        # 未开抗锯齿：重绘区域无需为抗锯齿外扩一像素
+        self.setOptimizationFlag(QtWidgets.QGraphicsView.DontAdjustForAntialiasing, True)
         # 默认不使用手型拖拽，保持箭头光标
         self.setDragMode(QtWidgets.QGraphicsView.NoDrag)
         self.viewport().setCursor(QtCore.Qt.ArrowCursor)
@@ -0,0 +1,80 @@
+# thumb_cache.py
+# 缩略图两级缓存：
+#   磁盘：<CacheLocation>/thumbs/<sha1(abspath|mtime|WxH)>.png，跨启动复用（线程安全，可在工作线程调用）
+#   内存：QPixmapCache，同一 key 共享像素数据、超限自动淘汰（仅 GUI 线程）
+import hashlib
+import os
+from typing import Optional
+
+from PySide6 import QtCore, QtGui
+
+_cache_dir: Optional[str] = None
+
+
+def _thumbs_dir() -> str:
+    global _cache_dir
+    if _cache_dir is None:
+        base = QtCore.QStandardPaths.writableLocation(QtCore.QStandardPaths.CacheLocation)
+        _cache_dir = os.path.join(base, "thumbs")
+        os.makedirs(_cache_dir, exist_ok=True)
+    return _cache_dir
+
+
+def cache_key(path: str, w: int, h: int, mtime: Optional[float] = None) -> str:
+    """缓存键：源文件绝对路径 + 修改时间 + 目标尺寸；源文件被改动后自然失效。"""
+    if mtime is None:
+        mtime = os.path.getmtime(path)
+    raw = f"{os.path.abspath(path)}|{mtime}|{int(w)}x{int(h)}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _decode_scaled(path: str, w: int, h: int) -> QtGui.QImage:
+    reader = QtGui.QImageReader(path)
+    reader.setAutoTransform(True)
+    sz = reader.size()
+    if sz.isValid():
+        sz.scale(w, h, QtCore.Qt.KeepAspectRatio)
+        reader.setScaledSize(sz)     # 解码器直接输出缩小后的像素
+    return reader.read()
+
+
+def get_or_build(path: str, w: int, h: int, key: Optional[str] = None) -> QtGui.QImage:
+    """读磁盘缩略图；未命中则按目标尺寸解码原图并落盘。失败返回空 QImage。"""
+    try:
+        key = key or cache_key(path, w, h)
+        cpath = os.path.join(_thumbs_dir(), key + ".png")
+    except OSError:
+        return _decode_scaled(path, w, h)
+
+    if os.path.isfile(cpath):
+        img = QtGui.QImage(cpath)
+        if not img.isNull():
+            return img
+
+    img = _decode_scaled(path, w, h)
+    # 已存在则不重复写；先写临时文件再原子替换，避免并发读到半截文件
+    if not img.isNull() and not os.path.exists(cpath):
+        tmp = f"{cpath}.{os.getpid()}.{id(img)}.tmp"
+        try:
+            if img.save(tmp, "PNG"):
+                os.replace(tmp, cpath)
+        except OSError:
+            pass
+        finally:
+            if os.path.exists(tmp):
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+    return img
+
+
+def find_pixmap(key: str) -> Optional[QtGui.QPixmap]:
+    """内存层查找（GUI 线程）。"""
+    pm = QtGui.QPixmap()
+    return pm if QtGui.QPixmapCache.find(key, pm) else None
+
+
+def insert_pixmap(key: str, pm: QtGui.QPixmap) -> None:
+    """写入内存层（GUI 线程）。"""
+    QtGui.QPixmapCache.insert(key, pm)
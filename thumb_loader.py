@@ -0,0 +1,72 @@
+# thumb_loader.py
+# 缩略图后台加载：工作线程走 thumb_cache 磁盘层（未命中则按目标尺寸解码），结果排队回 GUI 线程
+from typing import Callable, Dict, List, Optional, Tuple
+
+import shiboken6
+from PySide6 import QtCore, QtGui
+
+import thumb_cache
+
+
+class _ThumbTask(QtCore.QRunnable):
+    def __init__(self, loader: "ThumbnailLoader", key: str, path: str, w: int, h: int):
+        super().__init__()
+        self._loader = loader
+        self._key, self._path, self._w, self._h = key, path, w, h
+
+    def run(self) -> None:
+        img = thumb_cache.get_or_build(self._path, self._w, self._h, self._key)
+        # loader 位于 GUI 线程：跨线程 emit 自动走排队连接
+        self._loader._done.emit(self._key, self._path, img)
+
+
+class ThumbnailLoader(QtCore.QObject):
+    """全局缩略图加载器：内存层命中直接回调；同一缩略图正在加载时只排一次任务，完成后逐个回调。"""
+    _done = QtCore.Signal(str, str, QtGui.QImage)
+    _inst = None
+
+    @staticmethod
+    def instance() -> "ThumbnailLoader":
+        if ThumbnailLoader._inst is None:
+            ThumbnailLoader._inst = ThumbnailLoader()
+        return ThumbnailLoader._inst
+
+    def __init__(self):
+        super().__init__()
+        self._pool = QtCore.QThreadPool(self)
+        # 留一个核给 GUI 线程
+        self._pool.setMaxThreadCount(max(1, QtCore.QThread.idealThreadCount() - 1))
+        # cache key -> [(receiver, callback), ...]
+        self._pending: Dict[str, List[Tuple[QtCore.QObject, Callable]]] = {}
+        self._done.connect(self._dispatch)
+
+    def request(self, path: str, w: int, h: int,
+                receiver: QtCore.QObject, callback: Callable[[str, QtGui.QPixmap], None],
+                mtime: Optional[float] = None) -> None:
+        """取 path 的 w×h 缩略图，在 GUI 线程调用 callback(path, pixmap)。
+        内存层命中时同步回调；receiver 已销毁时不回调。"""
+        try:
+            key = thumb_cache.cache_key(path, w, h, mtime)
+        except OSError:
+            return                                   # 源文件不可访问：保持占位
+        pm = thumb_cache.find_pixmap(key)
+        if pm is not None:
+            callback(path, pm)
+            return
+        waiters = self._pending.get(key)
+        if waiters is not None:
+            waiters.append((receiver, callback))
+            return
+        self._pending[key] = [(receiver, callback)]
+        self._pool.start(_ThumbTask(self, key, path, int(w), int(h)))
+
+    @QtCore.Slot(str, str, QtGui.QImage)
+    def _dispatch(self, key: str, path: str, img: QtGui.QImage) -> None:
+        waiters = self._pending.pop(key, ())
+        if img.isNull():
+            return
+        pm = QtGui.QPixmap.fromImage(img)
+        thumb_cache.insert_pixmap(key, pm)           # 各卡片共享同一份像素数据
+        for receiver, callback in waiters:
+            if shiboken6.isValid(receiver):
+                callback(path, pm)
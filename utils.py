@@ -1,5 +1,6 @@
-import os, math
-from typing import List, Tuple
+import os
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Dict, List, Tuple
 from PySide6 import QtCore, QtGui
 from models import Difference, RADIUS_LEVELS
 import img_rc
@@ -8,7 +9,10 @@ QImage = QtGui.QImage
 
 def _round_half_up(x: float) -> int:
     # 与 round() 的 bankers rounding 不同，这里 0.5 -> 1，1.5 -> 2，更稳定
-    return int(math.floor(x + 0.5))
+    # 即 floor(x + 0.5)：int() 向零截断，负数非整时再减 1，免去 math.floor 调用
+    y = x + 0.5
+    i = int(y)
+    return i - 1 if y < i else i
 
 def quantize_roi(x: float, y: float, w: float, h: float, W: int, H: int):
     l = max(0, min(W-1, _round_half_up(x)))
@@ -17,8 +21,10 @@ def quantize_roi(x: float, y: float, w: float, h: float, W: int, H: int):
     qh = max(1, min(H - t, _round_half_up(h)))
     return l, t, qw, qh
 
+_MAX_RADIUS_IDX: int = len(RADIUS_LEVELS) - 1
+
 def _radius_for(lvl: int) -> int:
-    idx  = max(0, min(len(RADIUS_LEVELS) - 1, int(lvl)))
+    idx  = max(0, min(_MAX_RADIUS_IDX, int(lvl)))
     return int(RADIUS_LEVELS[idx])
 
 def  _qimage_from_path(path: str) -> QImage:
@@ -33,86 +39,138 @@ def _to_premultiplied(img:QImage) -> QImage:
     return img if img.format() == QImage.Format_ARGB32_Premultiplied \
                else img.convertToFormat(QImage.Format_ARGB32_Premultiplied)
 
+# level -> (预乘格式的圈图, DPR, 逻辑宽, 逻辑高)；等级只有十几个，解码+转换+尺寸计算每级只做一次
+_CIRCLE_META: Dict[int, Tuple[QImage, float, float, float]] = {}
+
+def _get_circle(lvl: int) -> Tuple[QImage, float, float, float]:
+    hit = _CIRCLE_META.get(lvl)
+    if hit is not None:
+        return hit
+    circle = _qimage_from_path(f":/img/c{lvl}.png")
+
+    # 先记住原 DPR，避免 _to_premultiplied 之后丢失
+    dpr = circle.devicePixelRatio() if hasattr(circle, "devicePixelRatio") else 1.0
+    circle = _to_premultiplied(circle)
+    try:
+        if dpr and hasattr(circle, "setDevicePixelRatio"):
+            circle.setDevicePixelRatio(dpr)
+    except Exception:
+        pass
+
+    # 圈图“逻辑尺寸”（不缩放）
+    cw = circle.width()  / (dpr or 1.0)
+    ch = circle.height() / (dpr or 1.0)
+    meta = (circle, dpr, cw, ch)
+    _CIRCLE_META[lvl] = meta
+    return meta
+
 def compose_result(level_dir: str, name: str, ext: str, differences: List[Difference], margin: int = 40, gap: int = 24) -> QImage :
+    """生成 B/apreview.png 四宫格预览，并另存上下两张合成图（导出产物需要）。"""
     origin_path = os.path.join(level_dir, f"A", f"{name}_origin{ext}")
     base = _qimage_from_path(origin_path)
     up_img, down_img = _render_regions_to_origin(base, differences, level_dir, name)
     up_img.save(os.path.join(level_dir, "B", "composite_up.png"))
     down_img.save(os.path.join(level_dir, "B", "composite_down.png"))
 
-    up_ov, down_ov = _render_circle_over_image(up_img, down_img, differences)
-
-    result = _compose_four_grid(up_img, down_img, up_ov, down_ov)
+    # 下排的圈直接画进四宫格画布，不再另建两张整图副本
+    result = _compose_four_grid(up_img, down_img, differences)
 
     result.save(os.path.join(level_dir, "B", "apreview.png"))
 
 def _render_regions_to_origin(base: QtGui.QImage, differences: List[Difference], level_dir: str, name: str) -> Tuple[QImage, QImage]:
-    up_img = _to_premultiplied(base).copy()
-    down_img = up_img.copy()
+    # QImage 隐式共享：两侧先共用同一份像素，QPainter 开画时才各自分离（只在真有贴图的一侧拷贝）
+    up_img = QImage(_to_premultiplied(base))
+    down_img = QImage(up_img)
     W, H = base.width(), base.height()
     bounds = QtCore.QRect(0, 0, W, H)
 
-    for idx, d in enumerate(differences, start = 1):
-        rpath = os.path.join(level_dir, f"A", f"{name}_region{idx}.png")
-        if not os.path.isfile(rpath):
-            continue
-        small = _qimage_from_path(rpath)
-        if small.isNull():
-            continue
-        l, t, _, _ = quantize_roi(d.x, d.y, d.width, d.height, W, H)
-        sec = d.section
-        if sec == "up":
-            _draw_to_image(up_img, small, l, t, bounds)
-        elif sec == "down":
-            _draw_to_image(down_img, small, l, t, bounds)
+    # 区域图是否存在：读一次目录代替逐个 stat
+    a_dir = os.path.join(level_dir, "A")
+    try:
+        region_files = set(os.listdir(a_dir))
+    except OSError:
+        region_files = set()
+
+    # 所有区域图的解码先一次性提交到线程池；合成端按原顺序取结果，到一张画一张（解码与贴图流水重叠）
+    with ThreadPoolExecutor(max_workers=2) as decoder:
+        pending = {"up": [], "down": []}
+        for idx, d in enumerate(differences, start = 1):
+            side = pending.get(d.section)
+            if side is None:
+                continue                      # 不属于任一侧：不必读盘解码
+            fname = f"{name}_region{idx}.png"
+            if fname not in region_files:
+                continue
+            l, t, _, _ = quantize_roi(d.x, d.y, d.width, d.height, W, H)
+            side.append((decoder.submit(_load_region, os.path.join(a_dir, fname)), l, t))
+
+        # 两侧目标互不相干：都有贴图时各占一个线程并行合成（drawImage 在 C++ 内执行，不持 GIL）
+        if pending["up"] and pending["down"]:
+            with ThreadPoolExecutor(max_workers=2) as ex:
+                jobs = [ex.submit(_draw_stream, up_img, pending["up"], bounds),
+                        ex.submit(_draw_stream, down_img, pending["down"], bounds)]
+                for f in as_completed(jobs):
+                    f.result()
+        else:
+            _draw_stream(up_img, pending["up"], bounds)
+            _draw_stream(down_img, pending["down"], bounds)
 
     return up_img, down_img
 
-def _render_circle_over_image(up_img: QImage, down_img: QImage,
-                              differences: List[Difference]) -> Tuple[QImage, QImage]:
-    u = up_img.copy()
-    d = down_img.copy()
-    W, H = u.width(), u.height()
-    bounds = QtCore.QRect(0, 0, W, H)
-
+def _load_region(path: str) -> QImage:
+    """解码区域图（可在工作线程执行）。"""
+    small = _qimage_from_path(path)
+    # 原地转预乘（不另分配副本）：QPainter 在源/目标皆为 ARGB32_Premultiplied 时走 SIMD 混合快路径；
+    # 无 alpha 的图保持原格式，绘制时直接整块覆盖
+    if not small.isNull() and small.hasAlphaChannel() and small.format() != QImage.Format_ARGB32_Premultiplied:
+        small.convertTo(QImage.Format_ARGB32_Premultiplied)
+    return small
+
+def _draw_stream(target: QImage, jobs: List[Tuple["Future[QImage]", int, int]], bounds: QtCore.QRect):
+    """按提交顺序等待每张区域图解码完成并立即合成到 target；整批只开一次 QPainter。"""
+    p = None
+    for fut, l, t in jobs:
+        blits = _clip_draws([(fut.result(), l, t)], bounds)
+        if not blits:
+            continue
+        if p is None:
+            p = QtGui.QPainter(target)
+            p.setRenderHints(QtGui.QPainter.RenderHint(0))
+        _paint_blits(p, blits)
+    if p is not None:
+        p.end()
+
+def _circle_draws(differences: List[Difference]) -> List[Tuple[QImage, int, int]]:
+    """每个不同点的提示圈贴图：(圈图, 左上角 x, y)，图像坐标。"""
+    draws = []
     for diff in differences:
         # 圆心：未设置则回退到红框中心（与编辑器一致）
         cx = diff.cx if diff.cx >= 0 else (diff.x + diff.width  * 0.5)
         cy = diff.cy if diff.cy >= 0 else (diff.y + diff.height * 0.5)
 
-        lvl = int(diff.hint_level)
-        circle = _qimage_from_path(f":/img/c{lvl}.png")
-
-        # 先记住原 DPR，避免 _to_premultiplied 之后丢失
-        dpr = circle.devicePixelRatio() if hasattr(circle, "devicePixelRatio") else 1.0
-        circle = _to_premultiplied(circle)
-        try:
-            if dpr and hasattr(circle, "setDevicePixelRatio"):
-                circle.setDevicePixelRatio(dpr)
-        except Exception:
-            pass
-
-        # 圈图“逻辑尺寸”（不缩放）
-        cw = circle.width()  / (dpr or 1.0)
-        ch = circle.height() / (dpr or 1.0)
+        circle, _, cw, ch = _get_circle(int(diff.hint_level))
 
         # 以圆心对齐贴图：左上角 = (cx - cw/2, cy - ch/2)
         x = _round_half_up(cx - cw * 0.5)
         y = _round_half_up(cy - ch * 0.5)
 
-        _draw_to_image(u, circle, int(x), int(y), bounds)
-        _draw_to_image(d, circle, int(x), int(y), bounds)
+        draws.append((circle, int(x), int(y)))
+    return draws
 
-    return u, d
 
-
-def _compose_four_grid(up_img: QImage, down_img: QImage, overlay_up:QImage, overlay_down: QImage, margin: int = 40, gap: int = 24)-> QImage:
+def _compose_four_grid(up_img: QImage, down_img: QImage, differences: List[Difference],
+                       margin: int = 40, gap: int = 24)-> QImage:
+    """
+    四宫格：上排 up/down 原样，下排 up/down 叠加提示圈。
+    圈直接画到画布下排格子里（裁剪到格内），SourceOver 满足结合律，结果与先叠圈再拼图一致。
+    """
     w, h = up_img.width(), up_img.height()
 
     W = margin + w + gap + w + margin
     H = margin + h + gap + h + margin
 
-    canvas = QImage(W, H, QImage.Format_ARGB32_Premultiplied)
+    # 画布底色不透明白，结果恒不透明：用 RGB32（同为 32 位步长）走无 alpha 目标的快路径
+    canvas = QImage(W, H, QImage.Format_RGB32)
     canvas.fill(QtGui.QColor(255, 255, 255))
 
     p = QtGui.QPainter(canvas)
@@ -128,29 +186,58 @@ def _compose_four_grid(up_img: QImage, down_img: QImage, overlay_up:QImage, over
     p.drawImage(QtCore.QPoint(x1, y1), up_img)
     p.drawImage(QtCore.QPoint(x2, y1), down_img)
     # 下排：左=up_overlay，右=down_overlay
-    p.drawImage(QtCore.QPoint(x1, y2), overlay_up)
-    p.drawImage(QtCore.QPoint(x2, y2), overlay_down)
+    p.drawImage(QtCore.QPoint(x1, y2), up_img)
+    p.drawImage(QtCore.QPoint(x2, y2), down_img)
+
+    # 圈位两侧相同：按单图尺寸裁剪一次，平移到两个下排格子各画一遍
+    blits = _clip_draws(_circle_draws(differences), QtCore.QRect(0, 0, w, h))
+    p.translate(x1, y2)
+    _paint_blits(p, blits)
+    p.translate(x2 - x1, 0)
+    _paint_blits(p, blits)
 
     p.end()
     return canvas
 
-def _draw_to_image(target: QImage, small: QImage, l:int, t: int, bounds: QtCore.QRect):
-    if small.isNull():
-        return
-    small = _to_premultiplied(small)
-    sw, sh = small.width(), small.height()
-    dest = QtCore.QRect(l, t, sw, sh)
-    inter = dest.intersected(bounds)
-    if inter.isEmpty():
-        return
-    src = QtCore.QRect(
-        inter.left() - dest.left(),
-        inter.top() - dest.top(),
-        inter.width(), inter.height()
-    )
-
-    p = QtGui.QPainter(target)
-    p.setCompositionMode(QtGui.QPainter.CompositionMode_SourceOver)
-    p.setRenderHints(QtGui.QPainter.RenderHint(0))
-    p.drawImage(inter.topLeft(), small, src)
-    p.end()
\ No newline at end of file
+# 裁剪后的绘制项：(图, 目标左上角, 源子矩形或 None=整图, 合成模式)
+_Blit = Tuple[QImage, QtCore.QPoint, "QtCore.QRect | None", QtGui.QPainter.CompositionMode]
+
+def _clip_draws(draws: List[Tuple[QImage, int, int]], bounds: QtCore.QRect) -> List[_Blit]:
+    """
+    把 (img, l, t) 裁剪到 bounds，算出目标点/源子矩形/合成模式；结果可对多张同尺寸目标复用。
+    带 alpha 的图须由调用方事先转成 ARGB32_Premultiplied（区域图解码后原地转换，圈图缓存时已转换）。
+    无 alpha 通道的小图全不透明，SourceOver 退化为覆盖：改用 Source 模式省去逐像素混合。
+    """
+    out: List[_Blit] = []
+    for small, l, t in draws:
+        if small.isNull():
+            continue
+        opaque = not small.hasAlphaChannel()
+        sw, sh = small.width(), small.height()
+        dest = QtCore.QRect(l, t, sw, sh)
+        if bounds.contains(dest):
+            inter, src = dest, None       # 未被裁剪：整图一次连续拷贝，不走子矩形
+        else:
+            inter = dest.intersected(bounds)
+            if inter.isEmpty():
+                continue
+            src = QtCore.QRect(
+                inter.left() - dest.left(),
+                inter.top() - dest.top(),
+                inter.width(), inter.height()
+            )
+        mode = QtGui.QPainter.CompositionMode_Source if opaque else QtGui.QPainter.CompositionMode_SourceOver
+        out.append((small, inter.topLeft(), src, mode))
+    return out
+
+def _paint_blits(p: QtGui.QPainter, blits: List[_Blit]):
+    """在已打开的 painter 上按 _clip_draws 的结果依次绘制。"""
+    cur = None
+    for small, pt, src, mode in blits:
+        if mode != cur:
+            p.setCompositionMode(mode)
+            cur = mode
+        if src is None:
+            p.drawImage(pt, small)
+        else:
+            p.drawImage(pt, small, src)